@@ -480,7 +480,7 @@ CREATE TABLE fallas (
     sensor_id UUID REFERENCES sensores(id) ON DELETE SET NULL,
     componente_id INTEGER NOT NULL REFERENCES componentes(id),
     usuario_id INTEGER REFERENCES usuarios(id) ON DELETE SET NULL,
-    codigo VARCHAR(50) NOT NULL UNIQUE,
+    codigo VARCHAR(50) NOT NULL,
     tipo VARCHAR(100) NOT NULL,
     titulo VARCHAR(200) NOT NULL,
     descripcion TEXT,
@@ -498,20 +498,52 @@ CREATE TABLE fallas (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     deleted_at TIMESTAMP,
     
-    CONSTRAINT chk_codigo_falla_format CHECK (codigo ~ '^FL-\d{8}-\d{3}$'),
+    CONSTRAINT chk_codigo_falla_format CHECK (codigo ~ '^FL-\d{8}-\d{3,}$'),
     CONSTRAINT chk_fecha_resolucion_posterior CHECK (fecha_resolucion IS NULL OR fecha_resolucion >= fecha_deteccion)
 );
 
 CREATE INDEX idx_fallas_moto ON fallas(moto_id);
 CREATE INDEX idx_fallas_componente ON fallas(componente_id);
 CREATE INDEX idx_fallas_sensor ON fallas(sensor_id);
-CREATE INDEX idx_fallas_codigo ON fallas(codigo);
+-- Código único solo entre fallas no eliminadas (soft-delete)
+CREATE UNIQUE INDEX ux_fallas_codigo_alive ON fallas(codigo) WHERE deleted_at IS NULL;
 CREATE INDEX idx_fallas_estado ON fallas(estado);
 CREATE INDEX idx_fallas_severidad ON fallas(severidad);
 CREATE INDEX idx_fallas_fecha_deteccion ON fallas(fecha_deteccion DESC);
+-- Índices parciales para listados de fallas (todas / activas)
+CREATE INDEX ix_fallas_moto_fecha ON fallas(moto_id, fecha_deteccion DESC)
+    WHERE deleted_at IS NULL;
+CREATE INDEX ix_fallas_activas ON fallas(moto_id, fecha_deteccion DESC)
+    WHERE estado <> 'resuelta' AND deleted_at IS NULL;
 
 COMMENT ON TABLE fallas IS 'Fallas detectadas por sensores, ML o reportadas manualmente';
-COMMENT ON COLUMN fallas.codigo IS 'Formato: FL-YYYYMMDD-NNN (ej: FL-20250110-001)';
+COMMENT ON COLUMN fallas.codigo IS 'Formato: FL-YYYYMMDD-NNN (ej: FL-20250110-001; desde la 1000 del día, más dígitos)';
+
+-- Generación de código FL-YYYYMMDD-NNN en el servidor (contador atómico por día)
+CREATE TABLE fallas_codigo_contador (
+    fecha DATE PRIMARY KEY,
+    ultimo INTEGER NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION asignar_codigo_falla() RETURNS TRIGGER AS $$
+DECLARE
+    dia DATE := COALESCE(NEW.fecha_deteccion, CURRENT_TIMESTAMP)::date;
+    numero INTEGER;
+BEGIN
+    INSERT INTO fallas_codigo_contador AS c (fecha, ultimo)
+    VALUES (dia, 1)
+    ON CONFLICT (fecha) DO UPDATE SET ultimo = c.ultimo + 1
+    RETURNING ultimo INTO numero;
+    NEW.codigo := 'FL-' || to_char(dia, 'YYYYMMDD') || '-' ||
+        CASE WHEN numero < 1000 THEN lpad(numero::text, 3, '0') ELSE numero::text END;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_fallas_codigo
+    BEFORE INSERT ON fallas
+    FOR EACH ROW WHEN (NEW.codigo IS NULL)
+    EXECUTE FUNCTION asignar_codigo_falla();
 
 -- Mantenimientos
 CREATE TABLE mantenimientos (
@@ -533,7 +565,7 @@ CREATE TABLE mantenimientos (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     deleted_at TIMESTAMP,
     
-    CONSTRAINT chk_codigo_mantenimiento_format CHECK (codigo ~ '^MNT-\d{8}-\d{3}$'),
+    CONSTRAINT chk_codigo_mantenimiento_format CHECK (codigo ~ '^MNT-\d{8}-\d{3,}$'),
     CONSTRAINT chk_kilometraje_valido CHECK (kilometraje_actual IS NULL OR kilometraje_actual >= 0),
     CONSTRAINT chk_kilometraje_siguiente_mayor CHECK (kilometraje_siguiente IS NULL OR kilometraje_siguiente > kilometraje_actual),
     CONSTRAINT chk_costos_no_negativos CHECK (
@@ -548,9 +580,38 @@ CREATE INDEX idx_mantenimientos_codigo ON mantenimientos(codigo);
 CREATE INDEX idx_mantenimientos_estado ON mantenimientos(estado);
 CREATE INDEX idx_mantenimientos_tipo ON mantenimientos(tipo);
 CREATE INDEX idx_mantenimientos_fecha_programada ON mantenimientos(fecha_programada);
+-- Índice parcial para sumar costos por moto (solo filas vivas con costo)
+CREATE INDEX ix_mantenimientos_costo_real ON mantenimientos(moto_id) INCLUDE (costo_real)
+    WHERE costo_real IS NOT NULL AND deleted_at IS NULL;
 
 COMMENT ON TABLE mantenimientos IS 'Servicios y reparaciones (preventivo, correctivo, inspección)';
-COMMENT ON COLUMN mantenimientos.codigo IS 'Formato: MNT-YYYYMMDD-NNN (ej: MNT-20250110-001)';
+COMMENT ON COLUMN mantenimientos.codigo IS 'Formato: MNT-YYYYMMDD-NNN (ej: MNT-20250110-001; desde el 1000 del día, más dígitos)';
+
+-- Generación de código MNT-YYYYMMDD-NNN en el servidor (contador atómico por día)
+CREATE TABLE mantenimientos_codigo_contador (
+    fecha DATE PRIMARY KEY,
+    ultimo INTEGER NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION asignar_codigo_mantenimiento() RETURNS TRIGGER AS $$
+DECLARE
+    dia DATE := CURRENT_DATE;
+    numero INTEGER;
+BEGIN
+    INSERT INTO mantenimientos_codigo_contador AS c (fecha, ultimo)
+    VALUES (dia, 1)
+    ON CONFLICT (fecha) DO UPDATE SET ultimo = c.ultimo + 1
+    RETURNING ultimo INTO numero;
+    NEW.codigo := 'MNT-' || to_char(dia, 'YYYYMMDD') || '-' ||
+        CASE WHEN numero < 1000 THEN lpad(numero::text, 3, '0') ELSE numero::text END;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_mantenimientos_codigo
+    BEFORE INSERT ON mantenimientos
+    FOR EACH ROW WHEN (NEW.codigo IS NULL)
+    EXECUTE FUNCTION asignar_codigo_mantenimiento();
 
 -- ============================================
 -- SECCIÓN 8: TABLAS - MÓDULO VIAJES
@@ -0,0 +1,97 @@
+-- ============================================
+-- ACTUALIZACIÓN: TRIGGERS DE CÓDIGO
+-- Archivo: UPDATE_CODIGO_TRIGGERS.sql
+-- Descripción: Instala/actualiza la generación de códigos en el servidor
+--   (FL-YYYYMMDD-NNN, MNT-YYYYMMDD-NNN) en bases creadas antes del trigger. Idempotente:
+--   puede ejecutarse varias veces. init_db ejecuta el mismo DDL
+--   al arrancar (src/shared/db_codigo.py).
+-- Ejecutar DESPUÉS de CREATE_TABLES_MVP_V2.2.sql
+-- ============================================
+
+-- ============================================
+-- SECCIÓN: FALLAS
+-- ============================================
+CREATE TABLE IF NOT EXISTS fallas_codigo_contador (
+    fecha DATE PRIMARY KEY,
+    ultimo INTEGER NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION asignar_codigo_falla() RETURNS TRIGGER AS $$
+DECLARE
+    dia DATE := COALESCE(NEW.fecha_deteccion, CURRENT_TIMESTAMP)::date;
+    numero INTEGER;
+BEGIN
+    INSERT INTO fallas_codigo_contador AS c (fecha, ultimo)
+    VALUES (dia, 1)
+    ON CONFLICT (fecha) DO UPDATE SET ultimo = c.ultimo + 1
+    RETURNING ultimo INTO numero;
+    NEW.codigo := 'FL-' || to_char(dia, 'YYYYMMDD') || '-' ||
+        CASE WHEN numero < 1000 THEN lpad(numero::text, 3, '0') ELSE numero::text END;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Desde la falla 1000 del día el número tiene más de 3 dígitos
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'chk_codigo_falla_format'
+          AND position('{3,}' IN pg_get_constraintdef(oid)) = 0
+    ) THEN
+        ALTER TABLE fallas DROP CONSTRAINT chk_codigo_falla_format;
+        ALTER TABLE fallas ADD CONSTRAINT chk_codigo_falla_format
+            CHECK (codigo ~ '^FL-\d{8}-\d{3,}$');
+    END IF;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_fallas_codigo ON fallas;
+CREATE TRIGGER trg_fallas_codigo
+    BEFORE INSERT ON fallas
+    FOR EACH ROW WHEN (NEW.codigo IS NULL)
+    EXECUTE FUNCTION asignar_codigo_falla();
+
+-- ============================================
+-- SECCIÓN: MANTENIMIENTOS
+-- ============================================
+CREATE TABLE IF NOT EXISTS mantenimientos_codigo_contador (
+    fecha DATE PRIMARY KEY,
+    ultimo INTEGER NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION asignar_codigo_mantenimiento() RETURNS TRIGGER AS $$
+DECLARE
+    dia DATE := CURRENT_DATE;
+    numero INTEGER;
+BEGIN
+    INSERT INTO mantenimientos_codigo_contador AS c (fecha, ultimo)
+    VALUES (dia, 1)
+    ON CONFLICT (fecha) DO UPDATE SET ultimo = c.ultimo + 1
+    RETURNING ultimo INTO numero;
+    NEW.codigo := 'MNT-' || to_char(dia, 'YYYYMMDD') || '-' ||
+        CASE WHEN numero < 1000 THEN lpad(numero::text, 3, '0') ELSE numero::text END;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Desde el mantenimiento 1000 del día el número tiene más de 3 dígitos
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'chk_codigo_mantenimiento_format'
+          AND position('{3,}' IN pg_get_constraintdef(oid)) = 0
+    ) THEN
+        ALTER TABLE mantenimientos DROP CONSTRAINT chk_codigo_mantenimiento_format;
+        ALTER TABLE mantenimientos ADD CONSTRAINT chk_codigo_mantenimiento_format
+            CHECK (codigo ~ '^MNT-\d{8}-\d{3,}$');
+    END IF;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_mantenimientos_codigo ON mantenimientos;
+CREATE TRIGGER trg_mantenimientos_codigo
+    BEFORE INSERT ON mantenimientos
+    FOR EACH ROW WHEN (NEW.codigo IS NULL)
+    EXECUTE FUNCTION asignar_codigo_mantenimiento();
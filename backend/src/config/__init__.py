@@ -2,7 +2,7 @@
 Módulo de configuración de RIM.
 Exports centralizados para fácil importación.
 """
-from .settings import settings
+from .settings import settings, get_settings
 from .database import (
     Base,  # Importado desde shared/models.py en database.py
     engine,
@@ -23,6 +23,7 @@ from .logging import configure_logging
 __all__ = [
     # Settings
     "settings",
+    "get_settings",
     
     # Database
     "Base",
@@ -0,0 +1,47 @@
+"""
+Cache en Redis para lecturas agregadas.
+Proporciona un cliente async perezoso e invalidación tolerante a fallos.
+"""
+from typing import Optional
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+# ============================================
+# CLIENTE REDIS
+# ============================================
+_redis: Optional[Redis] = None
+
+
+def get_redis() -> Redis:
+    """Devuelve el cliente Redis compartido (se crea en el primer uso)."""
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis
+
+
+async def close_redis() -> None:
+    """Cierra el cliente Redis (llamar en el shutdown)."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+# ============================================
+# INVALIDACIÓN
+# ============================================
+async def invalidate(*keys: str) -> None:
+    """Elimina claves de cache (errores de Redis se registran y se ignoran)."""
+    if not keys:
+        return
+    try:
+        await get_redis().delete(*keys)
+    except RedisError as e:
+        logger.warning(f"No se pudieron invalidar claves {keys}: {e}")
@@ -13,6 +13,7 @@ import logging
 
 from .settings import settings
 from src.shared.models import Base  # Importar Base desde shared/models
+from src.shared.db_codigo import instalar_triggers_codigo
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,10 @@ engine = create_async_engine(
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_pre_ping=True,  # Verifica conexiones antes de usarlas
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,  # Evita conexiones cortadas por el servidor/firewall
+    # Cache de prepared statements de asyncpg: las consultas de los repositorios
+    # usan SQL fijo con bind params, así que cada forma se prepara una sola vez
+    connect_args={"prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE},
 )
 
 # ============================================
@@ -96,6 +101,12 @@ async def init_db():
             logger.error("Error inicializando la base de datos: %s", e)
             raise
 
+    # Triggers de código (idempotente): create_all solo los instala al crear
+    # la tabla, así que en bases existentes se instalan/actualizan aquí.
+    # Transacción aparte: un error ignorado arriba deja la anterior abortada.
+    async with engine.begin() as conn:
+        await instalar_triggers_codigo(conn)
+
 
 async def close_db():
     """Cierra todas las conexiones del pool."""
@@ -5,6 +5,7 @@ Proporciona utilidades comunes para inyección de dependencias.
 from typing import Optional
 from fastapi import Depends, Header, HTTPException, status
 from jose import jwt, JWTError
+from sqlalchemy import select, literal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .settings import settings
@@ -129,6 +130,36 @@ async def get_current_user(
     return user
 
 
+async def get_active_user_id(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> int:
+    """
+    Obtiene el ID del usuario autenticado verificando que siga existiendo y activo.
+    
+    Alternativa liviana a get_current_user para endpoints de escritura que
+    solo necesitan el ID: un `SELECT 1` por clave primaria en lugar de
+    cargar el Usuario completo.
+    
+    Raises:
+        UnauthorizedException: Si el usuario no existe, fue eliminado o está inactivo
+    """
+    # Importación tardía para evitar dependencias circulares
+    from ..auth.models import Usuario
+    
+    result = await db.execute(
+        select(literal(1)).where(
+            Usuario.id == user_id,
+            Usuario.activo.is_(True),
+            Usuario.deleted_at.is_(None)
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise UnauthorizedException("Usuario no encontrado")
+    
+    return user_id
+
+
 async def get_optional_user(
     token: Optional[str] = Depends(get_token_from_header),
     db: AsyncSession = Depends(get_db)
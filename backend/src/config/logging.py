@@ -5,15 +5,211 @@ and common library log-levels. Designed to be called early from `main.py`.
 """
 from __future__ import annotations
 
+import atexit
+import copy
 import logging
+import queue
 import sys
-from typing import Optional
+import threading
+import time
+from typing import Optional, TextIO
+
+# Profundidad de frame hasta el llamador original, por call-site (archivo, línea, función).
+# Evita recorrer la pila en cada registro interceptado hacia loguru.
+_depth_cache: dict[tuple[str, int, str], int] = {}
+
+# Ruta de logging/__init__.py ligada una vez. Se compara con `==` y no con `is`:
+# co_filename no es el mismo objeto que logging.__file__ (ni tras sys.intern).
+_LOGGING_FILE = logging.__file__
+
+
+# Formatter por defecto para renderizar tracebacks cuando el handler no tiene uno
+_EXC_FORMATTER = logging.Formatter()
+
+# Registro que acompaña a los errores de flush en handleError (no hay registro real)
+_FLUSH_RECORD = logging.makeLogRecord({"msg": "flush del stream de logging"})
+
+
+class _FastHandler(logging.Handler):
+    """Handler que solo encola el registro; un hilo daemon lo formatea y escribe.
+
+    En el hilo de la aplicación `emit` renderiza el mensaje (como
+    `QueueHandler.prepare`) y hace un `put_nowait` en una cola acotada: si
+    el hilo de escritura no da abasto, el registro se descarta y se cuenta
+    (el hilo informa los descartes en el propio stream). El hilo, que
+    arranca con el primer registro y se relanza si muere, aplica el
+    formatter (colores incluidos) y agrupa los `flush` cada `flush_every`
+    registros o `flush_interval` segundos.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        stream: TextIO,
+        flush_every: int = 64,
+        flush_interval: float = 0.05,
+        max_queue: int = 10000,
+    ) -> None:
+        super().__init__()
+        self.stream = stream
+        self.terminator = "\n"
+        # Callables ligados una vez: el hilo de escritura no resuelve atributos por registro
+        self._write = stream.write
+        self._flush_stream = stream.flush
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._atexit_registered = False
+        # Registros descartados por cola llena / ya informados por el hilo
+        self.dropped = 0
+        self._dropped_reported = 0
+
+    def _ensure_started(self) -> None:
+        # Doble chequeo: solo el primer registro (o el primero tras morir el hilo) toma el lock
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            return
+        with self._start_lock:
+            thread = self._thread
+            if self._closed or (thread is not None and thread.is_alive()):
+                return
+            thread = threading.Thread(target=self._run, name="rim-log-writer", daemon=True)
+            thread.start()
+            self._thread = thread
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Renderiza mensaje y traceback en el hilo que loguea.
+
+        Los argumentos se formatean ahora: si el llamador los muta después, o si
+        su `__repr__` depende de una sesión/loop, el hilo de escritura no los toca.
+        Se trabaja sobre una copia para no alterar el registro que ven otros handlers.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = (self.formatter or _EXC_FORMATTER).formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            prepared = self.prepare(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(prepared)
+        except queue.Full:
+            self.dropped += 1
+
+    def _handle_error(self, record: logging.LogRecord) -> None:
+        # handleError escribe en sys.stderr, que también puede estar cerrado
+        try:
+            self.handleError(record)
+        except Exception:
+            pass
+
+    def _flush_safely(self) -> None:
+        try:
+            dropped = self.dropped
+            if dropped != self._dropped_reported:
+                self._write(
+                    f"[logging] {dropped - self._dropped_reported} registros descartados "
+                    f"(cola llena){self.terminator}"
+                )
+                self._dropped_reported = dropped
+            self._flush_stream()
+        except Exception:
+            self._handle_error(_FLUSH_RECORD)
+
+    def _run(self) -> None:
+        # Ninguna excepción sale del bucle: un stream roto no debe matar el hilo
+        pending = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                record = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                if pending:
+                    self._flush_safely()
+                    pending = 0
+                    last_flush = time.monotonic()
+                continue
+
+            if record is self._STOP:
+                self._flush_safely()
+                return
+
+            if isinstance(record, threading.Event):
+                # Marca de flush(): todo lo encolado antes ya está escrito
+                self._flush_safely()
+                pending = 0
+                last_flush = time.monotonic()
+                record.set()
+                continue
+
+            try:
+                self._write(self.format(record))
+                self._write(self.terminator)
+            except Exception:
+                self._handle_error(record)
+            pending += 1
+            now = time.monotonic()
+            if pending >= self._flush_every or now - last_flush >= self._flush_interval:
+                self._flush_safely()
+                pending = 0
+                last_flush = now
+
+    def flush(self, timeout: float = 1.0) -> None:
+        """Espera a que el hilo de escritura vacíe la cola y haga flush del stream."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self) -> None:
+        with self._start_lock:
+            self._closed = True
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self._queue.put(self._STOP, timeout=1.0)
+            except queue.Full:
+                pass
+            thread.join(timeout=1.0)
+        super().close()
+
+
+def _replace_root_handlers(root: logging.Logger, handlers: list[logging.Handler]) -> None:
+    """Sustituye los handlers del root cerrando los anteriores (detiene sus hilos)."""
+    old_handlers = root.handlers[:]
+    root.handlers = handlers
+    for old in old_handlers:
+        try:
+            old.close()
+        except Exception:
+            pass
 
 
 def configure_logging(settings) -> None:
     """Configure root logging according to settings.
 
-    - Uses ANSI color codes when `settings.LOG_COLORS` is True.
+    - Uses ANSI color codes when `settings.LOG_COLORS` is True and stdout is a TTY.
     - Optionally initializes colorama on Windows when `settings.COLORAMA_ENABLED` is True.
     - Resets root handlers to avoid duplicates during reload.
     """
@@ -34,23 +230,40 @@ def configure_logging(settings) -> None:
             class _InterceptHandler(logging.Handler):
                 """Redirect standard logging records to loguru."""
 
+                def __init__(self, level: int = logging.NOTSET) -> None:
+                    super().__init__(level)
+                    # levelname stdlib -> nombre de nivel en loguru
+                    self._level_cache: dict[str, str | int] = {
+                        name: name for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+                    }
+
                 def emit(self, record: logging.LogRecord) -> None:
                     # Get corresponding Loguru level if it exists
-                    try:
-                        level = loguru_logger.level(record.levelname).name
-                    except Exception:
-                        level = record.levelno
+                    level = self._level_cache.get(record.levelname)
+                    if level is None:
+                        try:
+                            level = loguru_logger.level(record.levelname).name
+                        except Exception:
+                            level = record.levelno
+                        self._level_cache[record.levelname] = level
 
-                    # Find caller frame depth
-                    frame, depth = logging.currentframe(), 2
-                    while frame and frame.f_code.co_filename == logging.__file__:
-                        frame = frame.f_back
-                        depth += 1
+                    # Find caller frame depth (resuelto una sola vez por call-site)
+                    # La profundidad varía entre logger.info, logger.exception o un
+                    # LoggerAdapter en el mismo archivo: la clave es el call-site completo
+                    call_site = (record.pathname, record.lineno, record.funcName)
+                    depth = _depth_cache.get(call_site)
+                    if depth is None:
+                        # frame 0 = emit, 1 = Handler.handle: ambos se saltan de entrada
+                        frame, depth = sys._getframe(2), 2
+                        while frame is not None and frame.f_code.co_filename == _LOGGING_FILE:
+                            frame = frame.f_back
+                            depth += 1
+                        _depth_cache[call_site] = depth
 
                     loguru_logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
 
             # Clear existing root handlers and intercept
-            logging.root.handlers = [ _InterceptHandler() ]
+            _replace_root_handlers(logging.root, [_InterceptHandler()])
             logging.root.setLevel(0)
 
             # Optionally, reduce noisy libraries but allow loguru to control levels
@@ -91,39 +304,59 @@ def configure_logging(settings) -> None:
             "\x1b[90m",
         ]
 
-        _module_color_cache: dict[str, str] = {}
+        def __init__(self, *args, colors_enabled: bool = True, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self._colors_enabled = colors_enabled
+            # Plantilla `{}` capturada una vez: formatMessage es un format_map directo
+            self._fmt_cached: str = self._style._fmt
+            self._uses_time: bool = "{asctime" in self._fmt_cached
+            # Cadenas de nivel ya envueltas en ANSI: el hot path es un dict lookup
+            self._wrapped_levels: dict[str, str] = {
+                lvl: f"{color}{lvl}{self.RESET}" for lvl, color in self.LEVEL_COLORS.items()
+            }
+            # Cache key -> nombre de módulo ya coloreado (color + key + RESET).
+            # Se siembra una sola vez con los overrides de settings para no
+            # consultarlos en cada registro.
+            module_overrides = getattr(settings, "LOG_MODULE_COLORS", {}) or {}
+            self._module_color_cache: dict[str, str] = {
+                sys.intern(key): f"{color}{key}{self.RESET}" for key, color in module_overrides.items()
+            }
 
         def _get_module_key(self, record_name: str) -> str:
-            parts = record_name.split('.')
-            if len(parts) > 1 and parts[0] == 'src':
-                return parts[1]
-            return parts[0]
+            # partition evita la lista de split(); sys.intern deja la key
+            # como el mismo objeto en cada registro (lookup por identidad)
+            head, _, rest = record_name.partition('.')
+            if head == 'src' and rest:
+                head = rest.partition('.')[0]
+            return sys.intern(head)
 
         def _get_module_color(self, key: str) -> str:
-            # Primero, respetar colores explícitos definidos en settings
-            module_overrides = getattr(settings, "LOG_MODULE_COLORS", {}) or {}
-            if key in module_overrides:
-                return module_overrides[key]
+            """Devuelve `key` envuelto en su color ANSI (cacheado tras el primer uso)."""
+            return self._module_color_cache.get(key) or self._fill_cache(key)
 
-            if key in self._module_color_cache:
-                return self._module_color_cache[key]
-            idx = abs(hash(key)) % len(self.MODULE_PALETTE)
-            color = self.MODULE_PALETTE[idx]
-            self._module_color_cache[key] = color
-            return color
+        def _fill_cache(self, key: str) -> str:
+            # Módulo sin override: color determinístico de la paleta por hash
+            color = self.MODULE_PALETTE[abs(hash(key)) % len(self.MODULE_PALETTE)]
+            wrapped = f"{color}{key}{self.RESET}"
+            self._module_color_cache[key] = wrapped
+            return wrapped
 
-        def format(self, record: logging.LogRecord) -> str:
-            if getattr(settings, "LOG_COLORS", True):
-                level = record.levelname
-                level_color = self.LEVEL_COLORS.get(level, "")
-                module_key = self._get_module_key(record.name)
-                module_color = self._get_module_color(module_key)
+        def usesTime(self) -> bool:
+            return self._uses_time
 
+        def formatMessage(self, record: logging.LogRecord) -> str:
+            return self._fmt_cached.format_map(record.__dict__)
+
+        def format(self, record: logging.LogRecord) -> str:
+            if self._colors_enabled:
                 orig_levelname = record.levelname
                 orig_name = record.name
                 try:
-                    record.levelname = f"{level_color}{orig_levelname}{self.RESET}"
-                    record.name = f"{module_color}{module_key}{self.RESET}"
+                    record.levelname = self._wrapped_levels.get(orig_levelname, orig_levelname)
+                    module_key = getattr(record, "_module_key", None)
+                    if module_key is None:
+                        module_key = record._module_key = self._get_module_key(orig_name)
+                    record.name = self._get_module_color(module_key)
                     return super().format(record)
                 finally:
                     record.levelname = orig_levelname
@@ -131,18 +364,19 @@ def configure_logging(settings) -> None:
             # Fallback: no colors
             return super().format(record)
 
-    # Build handler
-    handler = logging.StreamHandler(sys.stdout)
+    # Build handler (formateo y escritura fuera del hilo de la aplicación)
+    handler = _FastHandler(sys.stdout)
     # Insertamos una tabulación entre el name y el message para separar visualmente
-    fmt = "%(asctime)s %(levelname)s %(name)s:\t%(message)s"
-    formatter = _ColorFormatter(fmt=fmt)
+    fmt = "{asctime} {levelname} {name}:\t{message}"
+    # Sin TTY (Docker, pipes, archivos) no se emiten códigos ANSI
+    colors_enabled = bool(getattr(settings, "LOG_COLORS", True)) and sys.stdout.isatty()
+    formatter = _ColorFormatter(fmt=fmt, style="{", colors_enabled=colors_enabled)
     handler.setFormatter(formatter)
 
     root = logging.getLogger()
-    # avoid duplicating handlers during autoreload
-    root.handlers = []
+    # avoid duplicating handlers during autoreload (y cerrar el hilo del handler previo)
+    _replace_root_handlers(root, [handler])
     root.setLevel(getattr(settings, "LOG_LEVEL", "INFO"))
-    root.addHandler(handler)
 
     # Reduce noisy library loggers
     logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
@@ -12,34 +12,62 @@ Cambios v2.3:
 - Tipo de falla ahora es string libre (no ENUM)
 """
 
-from .routes import router as fallas_router
-from .models import Falla, SeveridadFalla, EstadoFalla, OrigenDeteccion
-from .schemas import (
-    FallaCreate,
-    FallaUpdate,
-    FallaResponse,
-    FallaListResponse,
-    FallaStatsResponse,
-    FallaFilterParams
-)
-from .events import (
-    FallaDetectadaEvent,
-    FallaActualizadaEvent,
-    FallaResueltaEvent
-)
-from .use_cases import (
-    CreateFallaUseCase,
-    GetFallaByIdUseCase,
-    GetFallaByCodigoUseCase,
-    ListFallasByMotoUseCase,
-    UpdateFallaUseCase,
-    DiagnosticarFallaUseCase,
-    ResolverFallaUseCase,
-    GetFallaStatsUseCase,
-    AutoResolveFallasUseCase
-)
-from .repositories import FallaRepository
-from .validators import validate_falla_data, validate_transition_estado
+import importlib
+from typing import Any
+
+# Imports diferidos (PEP 562): cada símbolo se resuelve al primer acceso,
+# de modo que importar un solo nombre no arrastra routers, schemas y casos de uso.
+_LAZY: dict[str, tuple[str, str]] = {
+    # Router
+    "fallas_router": ("routes", "router"),
+    # Models
+    "Falla": ("models", "Falla"),
+    "SeveridadFalla": ("models", "SeveridadFalla"),
+    "EstadoFalla": ("models", "EstadoFalla"),
+    "OrigenDeteccion": ("models", "OrigenDeteccion"),
+    # Schemas
+    "FallaCreate": ("schemas", "FallaCreate"),
+    "FallaUpdate": ("schemas", "FallaUpdate"),
+    "FallaDiagnosticar": ("schemas", "FallaDiagnosticar"),
+    "FallaResponse": ("schemas", "FallaResponse"),
+    "FallaListResponse": ("schemas", "FallaListResponse"),
+    "FallaStatsResponse": ("schemas", "FallaStatsResponse"),
+    "FallaFilterParams": ("schemas", "FallaFilterParams"),
+    # Events
+    "FallaDetectadaEvent": ("events", "FallaDetectadaEvent"),
+    "FallaActualizadaEvent": ("events", "FallaActualizadaEvent"),
+    "FallaResueltaEvent": ("events", "FallaResueltaEvent"),
+    # Use Cases
+    "CreateFallaUseCase": ("use_cases", "CreateFallaUseCase"),
+    "GetFallaByIdUseCase": ("use_cases", "GetFallaByIdUseCase"),
+    "GetFallaByCodigoUseCase": ("use_cases", "GetFallaByCodigoUseCase"),
+    "ListFallasByMotoUseCase": ("use_cases", "ListFallasByMotoUseCase"),
+    "UpdateFallaUseCase": ("use_cases", "UpdateFallaUseCase"),
+    "DiagnosticarFallaUseCase": ("use_cases", "DiagnosticarFallaUseCase"),
+    "ResolverFallaUseCase": ("use_cases", "ResolverFallaUseCase"),
+    "GetFallaStatsUseCase": ("use_cases", "GetFallaStatsUseCase"),
+    "AutoResolveFallasUseCase": ("use_cases", "AutoResolveFallasUseCase"),
+    # Repository
+    "FallaRepository": ("repositories", "FallaRepository"),
+    # Validators
+    "validate_falla_data": ("validators", "validate_falla_data"),
+    "validate_transition_estado": ("validators", "validate_transition_estado"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), attr)
+    globals()[name] = value  # cachear: siguientes accesos no pasan por __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     # Router
@@ -54,6 +82,7 @@ __all__ = [
     # Schemas
     "FallaCreate",
     "FallaUpdate",
+    "FallaDiagnosticar",
     "FallaResponse",
     "FallaListResponse",
     "FallaStatsResponse",
@@ -8,12 +8,23 @@ Estos eventos pueden ser consumidos por:
 - Análisis ML (patrones de fallas)
 - Auditoría
 """
-from dataclasses import dataclass
+from __future__ import annotations
+
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
 
+from src.shared.event_bus import enqueue_event
+
+# Referencias ligadas una sola vez para el default_factory de `timestamp`
+_UTC = timezone.utc
+_now = datetime.now
+
+
+def _utcnow() -> datetime:
+    return _now(_UTC)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True, eq=False)
 class FallaDetectadaEvent:
     """
     Evento emitido cuando se detecta/crea una nueva falla.
@@ -33,11 +44,7 @@ class FallaDetectadaEvent:
     requiere_atencion_inmediata: bool
     usuario_id: int  # 0 si es detección automática
     origen: str  # "sensor", "ml", "manual"
-    timestamp: Optional[datetime]
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now(timezone.utc)
+    timestamp: datetime = field(default_factory=_utcnow)
     
     async def emit(self):
         """
@@ -48,8 +55,8 @@ class FallaDetectadaEvent:
         - Sistema de notificaciones
         - WebSocket broadcast
         """
-        # Por ahora solo logging
-        print(f"[EVENT] FallaDetectada: falla_id={self.falla_id}, tipo={self.tipo}, severidad={self.severidad}")
+        # Por ahora solo logging: se encola y el consumidor en background lo registra
+        enqueue_event(self)
         
         # Aquí iría la lógica real:
         # await event_bus.publish("falla.detectada", self)
@@ -57,7 +64,7 @@ class FallaDetectadaEvent:
         # await websocket_manager.broadcast(f"moto:{self.moto_id}", self)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class FallaActualizadaEvent:
     """
     Evento emitido cuando se actualiza una falla (cambio de estado, severidad, etc.).
@@ -73,15 +80,11 @@ class FallaActualizadaEvent:
     estado_anterior: str
     estado_nuevo: str
     usuario_id: int
-    timestamp: Optional[datetime]
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now(timezone.utc)
+    timestamp: datetime = field(default_factory=_utcnow)
     
     async def emit(self):
         """Emite el evento de actualización."""
-        print(f"[EVENT] FallaActualizada: falla_id={self.falla_id}, {self.estado_anterior} -> {self.estado_nuevo}")
+        enqueue_event(self)
         
         # Aquí iría la lógica real:
         # await event_bus.publish("falla.actualizada", self)
@@ -89,7 +92,7 @@ class FallaActualizadaEvent:
         #     await notificaciones_service.notificar_inicio_reparacion(self)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class FallaResueltaEvent:
     """
     Evento emitido cuando se resuelve una falla (estado -> RESUELTA).
@@ -107,15 +110,11 @@ class FallaResueltaEvent:
     costo_real: float  # 0.0 en v2.3 (se maneja en mantenimientos)
     dias_resolucion: int
     usuario_id: int
-    timestamp: Optional[datetime]
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now(timezone.utc)
+    timestamp: datetime = field(default_factory=_utcnow)
     
     async def emit(self):
         """Emite el evento de resolución."""
-        print(f"[EVENT] FallaResuelta: falla_id={self.falla_id}, dias={self.dias_resolucion}")
+        enqueue_event(self)
         
         # Aquí iría la lógica real:
         # await event_bus.publish("falla.resuelta", self)
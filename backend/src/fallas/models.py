@@ -6,11 +6,12 @@ MVP v2.3 - Alineado con CREATE_TABLES_MVP_V2.2.sql
 """
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy import String, Integer, Boolean, DateTime, Text, ForeignKey, Numeric, Enum as SQLEnum
+from sqlalchemy import String, Integer, Boolean, DateTime, Text, ForeignKey, Numeric, Index, text, FetchedValue, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
 from ..shared.models import BaseModel
+from ..shared.db_codigo import registrar_codigo_trigger
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from uuid import UUID
 
@@ -54,6 +55,31 @@ class Falla(BaseModel):
     """
     
     __tablename__ = "fallas"
+    # INSERT/UPDATE traen con RETURNING los valores del servidor (id, codigo,
+    # created_at, updated_at): el repositorio no necesita refresh() posterior
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Unicidad de código solo entre fallas vivas (los tombstones no ocupan el índice)
+        Index(
+            "ux_fallas_codigo_alive",
+            "codigo",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Índices parciales: solo cubren fallas vivas (la mayoría histórica está resuelta)
+        Index(
+            "ix_fallas_moto_fecha",
+            "moto_id",
+            text("fecha_deteccion DESC"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_fallas_activas",
+            "moto_id",
+            text("fecha_deteccion DESC"),
+            postgresql_where=text("estado <> 'resuelta' AND deleted_at IS NULL"),
+        ),
+    )
     
     # Relaciones (Foreign Keys)
     moto_id: Mapped[int] = mapped_column(
@@ -89,10 +115,9 @@ class Falla(BaseModel):
     # Información de la falla
     codigo: Mapped[str] = mapped_column(
         String(50),
-        unique=True,
-        index=True,
         nullable=False,
-        comment="Código único (FL-YYYYMMDD-NNN)"
+        server_default=FetchedValue(),
+        comment="Código único (FL-YYYYMMDD-NNN), asignado por trigger en INSERT"
     )
 
     tipo: Mapped[str] = mapped_column(
@@ -195,51 +220,32 @@ class Falla(BaseModel):
             f"<Falla {self.codigo} | "
             f"Moto: {self.moto_id} | "
             f"Tipo: {self.tipo} | "
-            f"Severidad: {self.severidad.value if isinstance(self.severidad, SeveridadFalla) else self.severidad}>"
+            f"Severidad: {self.severidad.value}>"
         )
     
+    @classmethod
+    def alive(cls):
+        """Filtro de soft-delete: fallas no eliminadas (deleted_at IS NULL)."""
+        return cls.deleted_at.is_(None)
+    
     @property
     def esta_resuelta(self) -> bool:
         """Verifica si la falla está resuelta."""
-        return (self.estado == EstadoFalla.RESUELTA if isinstance(self.estado, EstadoFalla) 
-                else self.estado == EstadoFalla.RESUELTA.value)
-    
-    @property
-    def dias_sin_resolver(self) -> int:
-        """Calcula días desde la detección sin resolver."""
-        if self.esta_resuelta:
-            return 0
-        delta = datetime.now(timezone.utc) - self.fecha_deteccion
-        return delta.days
+        # str-Enum: compara igual contra el miembro o contra su valor
+        return self.estado == EstadoFalla.RESUELTA
     
     @property
     def es_critica(self) -> bool:
         """Verifica si es una falla crítica."""
-        return (self.severidad == SeveridadFalla.CRITICA if isinstance(self.severidad, SeveridadFalla)
-                else self.severidad == SeveridadFalla.CRITICA.value)
-    
-    def to_dict(self) -> dict:
-        """Convierte el modelo a diccionario, serializando ENUMs correctamente."""
-        return {
-            "id": self.id,
-            "moto_id": self.moto_id,
-            "sensor_id": str(self.sensor_id) if self.sensor_id else None,
-            "componente_id": self.componente_id,
-            "usuario_id": self.usuario_id,
-            "codigo": self.codigo,
-            "tipo": self.tipo,
-            "titulo": self.titulo,
-            "descripcion": self.descripcion,
-            "severidad": self.severidad.value if isinstance(self.severidad, SeveridadFalla) else self.severidad,
-            "estado": self.estado.value if isinstance(self.estado, EstadoFalla) else self.estado,
-            "origen_deteccion": self.origen_deteccion.value if isinstance(self.origen_deteccion, OrigenDeteccion) else self.origen_deteccion,
-            "valor_actual": float(self.valor_actual) if self.valor_actual else None,
-            "valor_esperado": float(self.valor_esperado) if self.valor_esperado else None,
-            "requiere_atencion_inmediata": self.requiere_atencion_inmediata,
-            "puede_conducir": self.puede_conducir,
-            "solucion_sugerida": self.solucion_sugerida,
-            "fecha_deteccion": self.fecha_deteccion.isoformat() if self.fecha_deteccion else None,
-            "fecha_resolucion": self.fecha_resolucion.isoformat() if self.fecha_resolucion else None,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-        }
+        return self.severidad == SeveridadFalla.CRITICA
+
+
+# ============================================
+# CÓDIGO FL-YYYYMMDD-NNN (trigger en PostgreSQL)
+# ============================================
+registrar_codigo_trigger(
+    Falla.__table__,
+    prefix="FL",
+    entidad="falla",
+    dia_sql="COALESCE(NEW.fecha_deteccion, CURRENT_TIMESTAMP)::date",
+)
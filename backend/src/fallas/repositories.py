@@ -7,12 +7,87 @@ MVP v2.3 - Actualizado para alineación con CREATE_TABLES_MVP_V2.2.sql
 from typing import Optional, List
 from datetime import datetime, timedelta, timezone
 from sqlalchemy import select, func, and_, or_
-from typing import Optional, List, Dict
-from datetime import datetime, timedelta, date, timezone
-from sqlalchemy import select, func, and_
+from typing import Optional, List, Dict, Tuple, AsyncIterator
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update, func, and_, tuple_, false, true, ColumnElement, RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from src.config.settings import settings
+from src.config.cache import invalidate
 
 from .models import Falla, EstadoFalla, SeveridadFalla
+from .services import TIPOS_CRITICOS
+
+
+# Columnas que consume FallaListResponse (listados)
+_COLUMNAS_RESUMEN = (
+    Falla.id,
+    Falla.moto_id,
+    Falla.componente_id,
+    Falla.codigo,
+    Falla.tipo,
+    Falla.descripcion,
+    Falla.severidad,
+    Falla.estado,
+    Falla.origen_deteccion,
+    Falla.requiere_atencion_inmediata,
+    Falla.puede_conducir,
+    Falla.fecha_deteccion,
+    Falla.created_at,
+)
+
+
+# Cache de estadísticas por moto (tolera segundos de desfase). Solo se cachea
+# la respuesta completa en la ruta; el repositorio invalida esa única clave.
+STATS_CACHE_TTL = 60
+STATS_RESPONSE_KEY = "fallas:stats:response:{moto_id}:v1"
+
+
+async def _invalidar_stats(*moto_ids: int) -> None:
+    """Invalida las estadísticas cacheadas de las motos indicadas."""
+    await invalidate(*(
+        STATS_RESPONSE_KEY.format(moto_id=moto_id)
+        for moto_id in set(moto_ids)
+    ))
+
+
+def flags_conduccion_sql(severidad: SeveridadFalla) -> Dict[str, ColumnElement[bool]]:
+    """
+    Equivalente SQL de determine_puede_conducir y requiere_atencion_inmediata.
+    
+    Permite recalcular los flags en el propio UPDATE cuando cambia la
+    severidad, sin leer antes el tipo de la falla (se evalúa sobre la
+    columna tipo, que se guarda en minúsculas).
+    
+    Args:
+        severidad: Nueva severidad de la falla
+        
+    Returns:
+        Dict con expresiones para puede_conducir y requiere_atencion_inmediata
+    """
+    tipo_critico = Falla.tipo.in_(TIPOS_CRITICOS)
+    
+    if severidad == SeveridadFalla.CRITICA:
+        return {"puede_conducir": false(), "requiere_atencion_inmediata": true()}
+    if severidad == SeveridadFalla.ALTA:
+        return {"puede_conducir": ~tipo_critico, "requiere_atencion_inmediata": true()}
+    return {"puede_conducir": ~tipo_critico, "requiere_atencion_inmediata": tipo_critico}
+
+
+def _select_falla():
+    """
+    SELECT de entidades Falla para las lecturas que usan las rutas.
+    
+    Las respuestas (FallaResponse) solo leen columnas propias, así
+    que no se precarga ninguna relación. Con settings.STRICT_LOADING
+    cualquier acceso lazy a moto/componente/sensor/usuario lanza error en
+    lugar de disparar un SELECT por fila.
+    """
+    query = select(Falla)
+    if settings.STRICT_LOADING:
+        query = query.options(raiseload("*"))
+    return query
 
 
 class FallaRepository:
@@ -37,9 +112,10 @@ class FallaRepository:
         Returns:
             Falla creada con ID asignado
         """
+        # El flush hace INSERT ... RETURNING (eager_defaults): sin SELECT de refresh
         self.session.add(falla)
         await self.session.commit()
-        await self.session.refresh(falla)
+        await _invalidar_stats(falla.moto_id)
         return falla
     
     async def get_by_id(self, falla_id: int) -> Optional[Falla]:
@@ -53,11 +129,9 @@ class FallaRepository:
             Falla encontrada o None
         """
         result = await self.session.execute(
-            select(Falla).where(
-                and_(
-                    Falla.id == falla_id,
-                    Falla.deleted_at.is_(None)
-                )
+            _select_falla().where(
+                Falla.id == falla_id,
+                Falla.alive()
             )
         )
         return result.scalar_one_or_none()
@@ -73,24 +147,26 @@ class FallaRepository:
             Falla encontrada o None
         """
         result = await self.session.execute(
-            select(Falla).where(
-                and_(
-                    Falla.codigo == codigo,
-                    Falla.deleted_at.is_(None)
-                )
+            _select_falla().where(
+                Falla.codigo == codigo,
+                Falla.alive()
             )
         )
         return result.scalar_one_or_none()
     
-    async def get_by_moto(
+    async def get_page_by_moto(
         self,
         moto_id: int,
         solo_activas: bool = False,
         skip: int = 0,
         limit: int = 100
-    ) -> List[Falla]:
+    ) -> Tuple[List[RowMapping], int]:
         """
-        Obtiene todas las fallas de una moto.
+        Obtiene una página del resumen de fallas de una moto y el total.
+        
+        Proyecta solo las columnas de FallaListResponse (sin Text pesados
+        como solucion_sugerida ni instancias ORM) y calcula el total con
+        COUNT(*) OVER () en la misma consulta.
         
         Args:
             moto_id: ID de la moto
@@ -99,13 +175,14 @@ class FallaRepository:
             limit: Número máximo de registros
             
         Returns:
-            Lista de fallas
+            Tupla con (filas resumen de fallas, total de registros)
         """
-        query = select(Falla).where(
-            and_(
-                Falla.moto_id == moto_id,
-                Falla.deleted_at.is_(None)
-            )
+        query = select(
+            *_COLUMNAS_RESUMEN,
+            func.count().over().label("total")
+        ).where(
+            Falla.moto_id == moto_id,
+            Falla.alive()
         )
         
         if solo_activas:
@@ -114,89 +191,50 @@ class FallaRepository:
         query = query.order_by(Falla.fecha_deteccion.desc()).offset(skip).limit(limit)
         
         result = await self.session.execute(query)
-        return list(result.scalars().all())
-    
-    async def get_criticas_activas(self, moto_id: int) -> List[Falla]:
-        """
-        Obtiene fallas críticas activas de una moto.
+        rows = list(result.mappings().all())
         
-        Args:
-            moto_id: ID de la moto
-            
-        Returns:
-            Lista de fallas críticas sin resolver
-        """
-        result = await self.session.execute(
-            select(Falla).where(
-                and_(
-                    Falla.moto_id == moto_id,
-                    Falla.severidad == SeveridadFalla.CRITICA.value,
-                    Falla.estado != EstadoFalla.RESUELTA.value,
-                    Falla.deleted_at.is_(None)
-                )
-            ).order_by(Falla.fecha_deteccion.desc())
-        )
-        return list(result.scalars().all())
+        if rows:
+            return rows, rows[0]["total"]
+        # Página vacía: el total solo puede ser > 0 si el offset superó el final
+        if skip == 0:
+            return rows, 0
+        return rows, await self.count_by_moto(moto_id, solo_activas=solo_activas)
     
-    async def get_by_tipo(
-        self,
-        moto_id: int,
-        tipo: str,
-        skip: int = 0,
-        limit: int = 50
-    ) -> List[Falla]:
-        """
-        Obtiene fallas de un tipo específico para una moto.
-        
-        Args:
-            moto_id: ID de la moto
-            tipo: Tipo de falla
-            skip: Número de registros a saltar
-            limit: Número máximo de registros
-            
-        Returns:
-            Lista de fallas del tipo especificado
-        """
-        result = await self.session.execute(
-            select(Falla).where(
-                and_(
-                    Falla.moto_id == moto_id,
-                    Falla.tipo == tipo,
-                    Falla.deleted_at.is_(None)
-                )
-            ).order_by(Falla.fecha_deteccion.desc()).offset(skip).limit(limit)
-        )
-        return list(result.scalars().all())
-    
-    async def get_recientes(
+    async def iter_recientes(
         self,
         moto_id: int,
         dias: int = 30,
-        limit: int = 50
-    ) -> List[Falla]:
+        batch_size: int = 500
+    ) -> AsyncIterator[RowMapping]:
         """
-        Obtiene fallas recientes de una moto.
+        Itera el resumen de fallas recientes de una moto sin materializarlo.
+        
+        Usa un cursor de servidor (stream_results) con yield_per: la memoria
+        queda acotada a un lote y el consumidor empieza antes de que la
+        consulta termine. Lo consume la exportación NDJSON
+        (GET /fallas/motos/{moto_id}/export, ver routes.export_fallas).
         
         Args:
             moto_id: ID de la moto
             dias: Número de días hacia atrás
-            limit: Número máximo de registros
+            batch_size: Filas por lote traídas del servidor
             
-        Returns:
-            Lista de fallas recientes
+        Yields:
+            Filas con las columnas de FallaListResponse
         """
         fecha_desde = datetime.now(timezone.utc) - timedelta(days=dias)
         
-        result = await self.session.execute(
-            select(Falla).where(
-                and_(
-                    Falla.moto_id == moto_id,
-                    Falla.fecha_deteccion >= fecha_desde,
-                    Falla.deleted_at.is_(None)
-                )
-            ).order_by(Falla.fecha_deteccion.desc()).limit(limit)
+        result = await self.session.stream(
+            select(*_COLUMNAS_RESUMEN).where(
+                Falla.moto_id == moto_id,
+                Falla.fecha_deteccion >= fecha_desde,
+                Falla.alive()
+            ).order_by(
+                Falla.fecha_deteccion.desc()
+            ).execution_options(yield_per=batch_size)
         )
-        return list(result.scalars().all())
+        async for row in result.mappings():
+            yield row
     
     async def update(self, falla: Falla) -> Falla:
         """
@@ -208,8 +246,41 @@ class FallaRepository:
         Returns:
             Falla actualizada
         """
+        # UPDATE ... RETURNING updated_at (eager_defaults): sin SELECT de refresh
+        await self.session.commit()
+        await _invalidar_stats(falla.moto_id)
+        return falla
+    
+    async def update_returning(
+        self,
+        falla_id: int,
+        valores: Dict[str, object],
+        estado_previo: Optional[EstadoFalla] = None
+    ) -> Optional[Falla]:
+        """
+        Actualiza una falla con un único UPDATE ... RETURNING (sin SELECT previo).
+        
+        Args:
+            falla_id: ID de la falla
+            valores: Columnas a actualizar (valores o expresiones SQL)
+            estado_previo: Si se indica, solo actualiza si la falla sigue en ese
+                estado (la validación de la transición es atómica)
+            
+        Returns:
+            Falla actualizada, o None si no existe o no estaba en `estado_previo`
+        """
+        stmt = update(Falla).where(
+            Falla.id == falla_id,
+            Falla.alive()
+        )
+        if estado_previo is not None:
+            stmt = stmt.where(Falla.estado == estado_previo)
+        
+        result = await self.session.execute(stmt.values(**valores).returning(Falla))
+        falla = result.scalar_one_or_none()
         await self.session.commit()
-        await self.session.refresh(falla)
+        if falla is not None:
+            await _invalidar_stats(falla.moto_id)
         return falla
     
     async def delete(self, falla_id: int) -> bool:
@@ -222,12 +293,21 @@ class FallaRepository:
         Returns:
             True si se eliminó, False si no existía
         """
-        falla = await self.get_by_id(falla_id)
-        if not falla:
-            return False
-        
-        falla.deleted_at = datetime.now(timezone.utc)
+        # Un solo UPDATE ... RETURNING en lugar de SELECT + UPDATE
+        result = await self.session.execute(
+            update(Falla)
+            .where(
+                Falla.id == falla_id,
+                Falla.alive()
+            )
+            .values(deleted_at=datetime.now(timezone.utc))
+            .returning(Falla.moto_id)
+        )
+        moto_id = result.scalar_one_or_none()
         await self.session.commit()
+        if moto_id is None:
+            return False
+        await _invalidar_stats(moto_id)
         return True
     
     async def count_by_moto(self, moto_id: int, solo_activas: bool = False) -> int:
@@ -242,10 +322,8 @@ class FallaRepository:
             Número de fallas
         """
         query = select(func.count(Falla.id)).where(
-            and_(
-                Falla.moto_id == moto_id,
-                Falla.deleted_at.is_(None)
-            )
+            Falla.moto_id == moto_id,
+            Falla.alive()
         )
         
         if solo_activas:
@@ -254,81 +332,94 @@ class FallaRepository:
         result = await self.session.execute(query)
         return result.scalar_one()
     
-    async def get_stats_by_tipo(self, moto_id: int) -> Dict[str, int]:
+    async def get_stats(
+        self,
+        moto_id: int
+    ) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, int]]:
         """
-        Obtiene estadísticas de fallas agrupadas por tipo.
+        Obtiene los conteos por tipo, severidad y estado en una sola pasada.
+        
+        Usa GROUPING SETS ((tipo), (severidad), (estado)) en lugar de tres GROUP BY.
         
         Args:
             moto_id: ID de la moto
             
         Returns:
-            Diccionario {tipo: count}
+            Tupla ({tipo: count}, {severidad: count}, {estado: count})
         """
         result = await self.session.execute(
             select(
                 Falla.tipo,
+                Falla.severidad,
+                Falla.estado,
+                func.grouping(Falla.tipo).label("sin_tipo"),
+                func.grouping(Falla.severidad).label("sin_severidad"),
                 func.count(Falla.id).label("count")
             ).where(
-                and_(
-                    Falla.moto_id == moto_id,
-                    Falla.deleted_at.is_(None)
+                Falla.moto_id == moto_id,
+                Falla.alive()
+            ).group_by(
+                func.grouping_sets(
+                    tuple_(Falla.tipo),
+                    tuple_(Falla.severidad),
+                    tuple_(Falla.estado)
                 )
-            ).group_by(Falla.tipo)
+            )
         )
         
-        return {row.tipo: row.count for row in result}
+        por_tipo: Dict[str, int] = {}
+        por_severidad: Dict[str, int] = {}
+        por_estado: Dict[str, int] = {}
+        for row in result:
+            # grouping(col) = 0 -> la fila pertenece al set de esa columna
+            if row.sin_tipo == 0:
+                por_tipo[row.tipo] = row.count
+            elif row.sin_severidad == 0:
+                por_severidad[row.severidad.value] = row.count
+            else:
+                por_estado[row.estado.value] = row.count
+        
+        return por_tipo, por_severidad, por_estado
     
-    async def get_stats_by_severidad(self, moto_id: int) -> Dict[str, int]:
+    async def get_resumen_stats(self, moto_id: int) -> RowMapping:
         """
-        Obtiene estadísticas de fallas agrupadas por severidad.
+        Obtiene totales y tiempo promedio de resolución en una sola consulta.
+        
+        Usa agregados condicionales (COUNT(*) FILTER (WHERE ...)) sobre una
+        única pasada de las fallas de la moto.
         
         Args:
             moto_id: ID de la moto
             
         Returns:
-            Diccionario {severidad: count}
+            Fila con total, activas, resueltas, criticas y
+            tiempo_promedio_resolucion (días enteros promediados, 0.0 si no hay)
         """
-        result = await self.session.execute(
-            select(
-                Falla.severidad,
-                func.count(Falla.id).label("count")
-            ).where(
-                and_(
-                    Falla.moto_id == moto_id,
-                    Falla.deleted_at.is_(None)
-                )
-            ).group_by(Falla.severidad)
+        resuelta = and_(
+            Falla.estado == EstadoFalla.RESUELTA.value,
+            Falla.fecha_resolucion.isnot(None)
+        )
+        # Mismo criterio que calculate_dias_resolucion: días completos, mínimo 0
+        dias_resolucion = func.greatest(
+            0,
+            func.extract("day", Falla.fecha_resolucion - Falla.fecha_deteccion)
         )
-        
-        return {row.severidad: row.count for row in result}
-    
-    async def count_by_date(self, fecha: date) -> int:
-        """
-        Cuenta el número de fallas creadas en una fecha específica.
-        Usado para generar códigos únicos secuenciales (FL-YYYYMMDD-NNN).
-        
-        Args:
-            fecha: Fecha a consultar
-            
-        Returns:
-            Número de fallas en esa fecha
-        """
-        from datetime import time
-        
-        fecha_inicio = datetime.combine(fecha, time.min)
-        fecha_fin = datetime.combine(fecha, time.max)
         
         result = await self.session.execute(
-            select(func.count(Falla.id)).where(
-                and_(
-                    Falla.fecha_deteccion >= fecha_inicio,
-                    Falla.fecha_deteccion <= fecha_fin,
-                    Falla.deleted_at.is_(None)
-                )
+            select(
+                func.count().label("total"),
+                func.count().filter(Falla.estado != EstadoFalla.RESUELTA.value).label("activas"),
+                func.count().filter(Falla.estado == EstadoFalla.RESUELTA.value).label("resueltas"),
+                func.count().filter(Falla.severidad == SeveridadFalla.CRITICA.value).label("criticas"),
+                func.coalesce(
+                    func.avg(dias_resolucion).filter(resuelta), 0.0
+                ).label("tiempo_promedio_resolucion")
+            ).where(
+                Falla.moto_id == moto_id,
+                Falla.alive()
             )
         )
-        
-        return result.scalar_one()
+        return result.mappings().one()
     
     async def get_by_estado(self, estado: EstadoFalla) -> List[Falla]:
         """
@@ -342,11 +433,9 @@ class FallaRepository:
             Lista de fallas en ese estado
         """
         result = await self.session.execute(
-            select(Falla).where(
-                and_(
-                    Falla.estado == estado,
-                    Falla.deleted_at.is_(None)
-                )
+            _select_falla().where(
+                Falla.estado == estado,
+                Falla.alive()
             ).order_by(Falla.fecha_deteccion.desc())
         )
         
@@ -6,6 +6,7 @@ Endpoints:
 - GET /fallas/{id} - Obtener falla por ID
 - GET /fallas/codigo/{codigo} - Obtener falla por código
 - GET /motos/{moto_id}/fallas - Listar fallas de una moto
+- GET /fallas/motos/{moto_id}/export - Exportar historial (NDJSON en streaming)
 - PATCH /fallas/{id} - Actualizar campos editables
 - POST /fallas/{id}/diagnosticar - Mover a EN_REPARACION
 - POST /fallas/{id}/resolver - Mover a RESUELTA
@@ -13,13 +14,20 @@ Endpoints:
 """
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+from redis.exceptions import RedisError
+import logging
 
-from src.config.dependencies import get_db, get_current_user
+from src.config.database import AsyncSessionLocal
+from src.config.dependencies import get_db, get_current_user, get_active_user_id
+from src.config.cache import get_redis
 from src.shared.base_models import PaginationParams
 from src.shared.exceptions import ResourceNotFoundException, ValidationException
 from ..auth.models import Usuario
 
+from .repositories import FallaRepository, STATS_CACHE_TTL, STATS_RESPONSE_KEY
 from .use_cases import (
     CreateFallaUseCase,
     GetFallaByIdUseCase,
@@ -33,13 +41,25 @@ from .use_cases import (
 from .schemas import (
     FallaCreate,
     FallaUpdate,
+    FallaDiagnosticar,
     FallaResponse,
     FallaListResponse,
     FallaStatsResponse,
     FallaFilterParams
 )
 
-router = APIRouter(prefix="/fallas", tags=["Fallas"])
+logger = logging.getLogger(__name__)
+
+# orjson para todas las respuestas del módulo (datetime/Enum serializados en C)
+router = APIRouter(prefix="/fallas", tags=["Fallas"], default_response_class=ORJSONResponse)
+
+# Campos del listado, en el orden del schema (las filas traen columnas extra como `total`)
+_CAMPOS_LISTADO = tuple(FallaListResponse.model_fields)
+
+
+def _dumps(content) -> bytes:
+    """Serializa filas crudas con orjson con el formato de fechas de Pydantic (UTC como "Z")."""
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
 
 
 # =============================================================================
@@ -164,16 +184,50 @@ async def list_fallas(
         use_case = ListFallasByMotoUseCase(db)
         fallas, total = await use_case.execute(filters, pagination)
         
-        return {
-            "items": [FallaListResponse.model_validate(f) for f in fallas],
+        # Filas ya tipadas desde la DB: se serializan directo con orjson,
+        # sin pasar por validación Pydantic (mismo JSON que FallaListResponse)
+        return Response(content=_dumps({
+            "items": [{campo: f[campo] for campo in _CAMPOS_LISTADO} for f in fallas],
             "total": total,
             "skip": skip,
             "limit": limit
-        }
+        }), media_type="application/json")
     except ValidationException as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+# =============================================================================
+# EXPORTAR HISTORIAL DE FALLAS (STREAMING)
+# =============================================================================
+
+@router.get(
+    "/motos/{moto_id}/export",
+    summary="Exportar historial de fallas de una moto",
+    description="Devuelve las fallas de los últimos `dias` como NDJSON en streaming"
+)
+async def export_fallas(
+    moto_id: int,
+    dias: int = Query(365, ge=1, le=3650, description="Días hacia atrás"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Exporta el historial de fallas de una moto (una falla por línea).
+    
+    GET /fallas/motos/{moto_id}/export (junto a /fallas/motos/{moto_id} y .../stats)
+    
+    Las filas se leen por lotes y se serializan a medida que llegan,
+    así la memoria no crece con el tamaño del historial.
+    """
+    repo = FallaRepository(db)
+    
+    async def generar_lineas():
+        async for f in repo.iter_recientes(moto_id, dias=dias):
+            yield _dumps({campo: f[campo] for campo in _CAMPOS_LISTADO}) + b"\n"
+    
+    return StreamingResponse(generar_lineas(), media_type="application/x-ndjson")
+
+
 # =============================================================================
 # ACTUALIZAR FALLA
 # =============================================================================
@@ -187,7 +241,7 @@ async def update_falla(
     falla_id: int,
     data: FallaUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: Usuario = Depends(get_current_user)
+    current_user_id: int = Depends(get_active_user_id)
 ):
     """
     Actualiza campos editables de una falla.
@@ -204,7 +258,7 @@ async def update_falla(
     """
     try:
         use_case = UpdateFallaUseCase(db)
-        falla = await use_case.execute(falla_id, data, usuario_id=current_user.id)
+        falla = await use_case.execute(falla_id, data, usuario_id=current_user_id)
         return falla
     except ResourceNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -223,9 +277,9 @@ async def update_falla(
 )
 async def diagnosticar_falla(
     falla_id: int,
-    solucion_sugerida: str = Query(..., min_length=10, description="Solución propuesta"),
+    data: FallaDiagnosticar,
     db: AsyncSession = Depends(get_db),
-    current_user: Usuario = Depends(get_current_user)
+    current_user_id: int = Depends(get_active_user_id)
 ):
     """
     Diagnostica una falla y la mueve a estado EN_REPARACION.
@@ -239,7 +293,7 @@ async def diagnosticar_falla(
     """
     try:
         use_case = DiagnosticarFallaUseCase(db)
-        falla = await use_case.execute(falla_id, solucion_sugerida, usuario_id=current_user.id)
+        falla = await use_case.execute(falla_id, data.solucion_sugerida, usuario_id=current_user_id)
         return falla
     except ResourceNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -259,7 +313,7 @@ async def diagnosticar_falla(
 async def resolver_falla(
     falla_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: Usuario = Depends(get_current_user)
+    current_user_id: int = Depends(get_active_user_id)
 ):
     """
     Resuelve una falla marcándola como RESUELTA.
@@ -274,7 +328,7 @@ async def resolver_falla(
     """
     try:
         use_case = ResolverFallaUseCase(db)
-        falla = await use_case.execute(falla_id, usuario_id=current_user.id)
+        falla = await use_case.execute(falla_id, usuario_id=current_user_id)
         return falla
     except ResourceNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -294,7 +348,6 @@ async def resolver_falla(
 )
 async def get_falla_stats(
     moto_id: int,
-    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     """
@@ -311,9 +364,25 @@ async def get_falla_stats(
     # if not current_user.es_premium:
     #     raise HTTPException(status_code=403, detail="Requiere plan Premium")
     
+    # Cache read-through en Redis; los writes del repositorio invalidan la clave
+    redis = get_redis()
+    key = STATS_RESPONSE_KEY.format(moto_id=moto_id)
+    try:
+        if (cached := await redis.get(key)) is not None:
+            return FallaStatsResponse.model_validate_json(cached)
+    except RedisError as e:
+        logger.warning(f"Redis no disponible, calculando stats sin cache: {e}")
+    
     try:
-        use_case = GetFallaStatsUseCase(db)
+        use_case = GetFallaStatsUseCase(AsyncSessionLocal)
         stats = await use_case.execute(moto_id)
-        return stats
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    except ResourceNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    try:
+        await redis.set(key, stats.model_dump_json(), ex=STATS_CACHE_TTL)
+    except RedisError as e:
+        logger.warning(f"No se pudo cachear {key}: {e}")
+    return stats
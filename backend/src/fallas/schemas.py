@@ -4,7 +4,7 @@ MVP v2.3 - Schema simplificado sin campos ML/diagnostic
 """
 from datetime import datetime, date
 from typing import Optional, Dict
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 
 from .models import SeveridadFalla, EstadoFalla, OrigenDeteccion
 
@@ -56,9 +56,10 @@ class FallaCreate(BaseModel):
     @classmethod
     def validate_tipo(cls, v: str) -> str:
         """Valida que el tipo no esté vacío (tipo es string libre en v2.3)."""
-        if not v or not v.strip():
+        tipo = v.strip()
+        if not tipo:
             raise ValueError("El tipo de falla no puede estar vacío")
-        return v.strip().lower()
+        return tipo.lower()
 
 
 class FallaUpdate(BaseModel):
@@ -81,6 +82,17 @@ class FallaUpdate(BaseModel):
     longitud: Optional[float] = Field(None, description="Actualizar longitud")
 
 
+class FallaDiagnosticar(BaseModel):
+    """Schema para diagnosticar una falla (DETECTADA -> EN_REPARACION)."""
+    
+    solucion_sugerida: str = Field(
+        ...,
+        min_length=10,
+        max_length=2000,
+        description="Solución propuesta"
+    )
+
+
 # ============================================
 # SCHEMAS DE RESPONSE
 # ============================================
@@ -114,8 +126,7 @@ class FallaResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FallaListResponse(BaseModel):
@@ -135,8 +146,7 @@ class FallaListResponse(BaseModel):
     fecha_deteccion: datetime
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FallaStatsResponse(BaseModel):
@@ -153,5 +163,4 @@ class FallaStatsResponse(BaseModel):
     
     tiempo_promedio_resolucion: float  # En días
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -2,12 +2,97 @@
 Servicios de lógica de negocio para fallas.
 MVP v2.3 - Actualizado para nuevo schema sin campos ML/diagnostic
 """
-from datetime import datetime, timezone
-from typing import Dict, Optional
+from datetime import datetime
+from typing import Dict
 
 from .models import SeveridadFalla, EstadoFalla, OrigenDeteccion
 
 
+# =============================================================================
+# TABLAS DE CONSULTA (se construyen una sola vez al importar el módulo)
+# =============================================================================
+
+# Fallas que NUNCA permiten conducir (también lo usa el repositorio en SQL)
+TIPOS_CRITICOS = frozenset((
+    "presion_aceite_baja",
+    "caida_detectada",
+    "falla_frenos",
+    "perdida_direccion",
+    "sobrecalentamiento_extremo",
+    "fuga_combustible",
+))
+
+# Tipos transitorios que pueden auto-resolverse
+_TIPOS_AUTO_RESOLUBLES = frozenset((
+    "vibracion_leve",
+    "temperatura_alta_temporal",
+    "bateria_baja_temporal",
+    "presion_neumaticos_baja_leve",
+))
+
+# Solución sugerida específica por tipo de falla
+_SOLUCIONES: Dict[str, str] = {
+    # Fallas de motor
+    "sobrecalentamiento": "🌡️ Detener la moto inmediatamente. Revisar nivel de refrigerante y sistema de enfriamiento. NO continuar hasta resolver.",
+    "sobrecalentamiento_extremo": "🚨 PELIGRO: Apagar motor AHORA. Esperar enfriamiento completo (30 min). Llamar asistencia.",
+    "presion_aceite_baja": "⚠️ Apagar motor inmediatamente. Revisar nivel de aceite. Si está bajo, NO encender hasta llenar. Puede haber fuga o falla de bomba.",
+    
+    # Fallas eléctricas
+    "bateria_baja": "🔋 Recargar batería. Si persiste, revisar alternador y conexiones. Evitar usar accesorios eléctricos.",
+    "falla_sistema_electrico": "⚡ Revisar conexiones, fusibles y alternador. Llevar a taller especializado.",
+    
+    # Fallas de combustible
+    "nivel_combustible_critico": "⛽ Cargar combustible inmediatamente. Evitar agotar completamente el tanque.",
+    "fuga_combustible": "🚨 DETENER MOTO. No encender. Revisar tanque, mangueras y carburador. Llamar asistencia.",
+    
+    # Fallas de frenos
+    "falla_frenos": "🛑 PELIGRO: No conducir. Revisar líquido de frenos, pastillas y discos. Llevar en grúa.",
+    "desgaste_pastillas_frenos": "🔧 Programar cambio de pastillas próximamente. Evitar frenadas bruscas.",
+    
+    # Fallas de neumáticos
+    "presion_neumaticos_baja": "🏍️ Revisar y ajustar presión de neumáticos. Delantero: 2.5 bar, Trasero: 2.9 bar (KTM 390).",
+    "desgaste_neumaticos": "🛞 Programar reemplazo de neumáticos. Profundidad mínima: 1.6mm.",
+    
+    # Fallas de suspensión
+    "falla_suspension": "🔩 Revisar amortiguadores, horquilla y rodamientos. Ajustar precarga si es necesario.",
+    
+    # Fallas de transmisión
+    "falla_cadena": "⛓️ Revisar tensión, lubricación y estado de cadena. Ajustar tensión o reemplazar si está muy desgastada.",
+    "falla_embrague": "🎛️ Revisar cable de embrague y ajuste. Puede necesitar cambio de discos.",
+    
+    # Otras fallas
+    "vibracion_anormal": "📳 Revisar balanceo de neumáticos, rodamientos y motor. Verificar montajes.",
+    "ruido_anormal": "🔊 Identificar origen del ruido (motor, cadena, frenos). Revisar en taller.",
+    "caida_detectada": "💥 Revisar daños estructurales, líquidos, controles y componentes críticos. Inspección completa obligatoria.",
+    "perdida_direccion": "🚨 PELIGRO EXTREMO: No conducir. Revisar dirección, horquilla, rodamientos y cuadro."
+}
+
+# Solución genérica según severidad (cuando el tipo no tiene una específica)
+_SOLUCION_BAJA = "ℹ️ BAJA: Revisar en próximo mantenimiento preventivo. Continuar monitoreando."
+_SOLUCION_POR_SEVERIDAD: Dict[SeveridadFalla, str] = {
+    SeveridadFalla.CRITICA: "🚨 CRÍTICO: Detener la moto de inmediato y solicitar asistencia técnica. No continuar hasta diagnosticar el problema.",
+    SeveridadFalla.ALTA: "⚠️ ALTA: Programar revisión urgente en taller. Evitar uso prolongado hasta resolver.",
+    SeveridadFalla.MEDIA: "🔧 MEDIA: Agendar revisión en taller en los próximos días. Monitorear comportamiento.",
+    SeveridadFalla.BAJA: _SOLUCION_BAJA,
+}
+
+# Severidad según el estado del componente
+_SEVERIDAD_POR_ESTADO: Dict[str, SeveridadFalla] = {
+    "CRITICO": SeveridadFalla.CRITICA,
+    "ATENCION": SeveridadFalla.ALTA,
+    "MANTENIMIENTO": SeveridadFalla.MEDIA,
+    "BUENO": SeveridadFalla.BAJA,
+}
+
+# Ajuste de prioridad (sobre base 5) según severidad
+_AJUSTE_PRIORIDAD_SEVERIDAD: Dict[SeveridadFalla, int] = {
+    SeveridadFalla.CRITICA: 4,
+    SeveridadFalla.ALTA: 2,
+    SeveridadFalla.MEDIA: 0,
+    SeveridadFalla.BAJA: -2,
+}
+
+
 # =============================================================================
 # DETERMINAR SI LA MOTO PUEDE CONDUCIRSE
 # =============================================================================
@@ -28,18 +113,8 @@ def determine_puede_conducir(tipo: str, severidad: SeveridadFalla) -> bool:
         - Tipos críticos específicos → NO conducir (independiente de severidad)
         - Resto → puede conducir con precaución
     """
-    # Fallas que NUNCA permiten conducir
-    tipos_criticos = [
-        "presion_aceite_baja",
-        "caida_detectada", 
-        "falla_frenos",
-        "perdida_direccion",
-        "sobrecalentamiento_extremo",
-        "fuga_combustible"
-    ]
-    
     # Si es tipo crítico, no puede conducir
-    if tipo.lower() in tipos_criticos:
+    if tipo.lower() in TIPOS_CRITICOS:
         return False
     
     # Si severidad es crítica, no puede conducir
@@ -65,57 +140,11 @@ def generate_solucion_sugerida(tipo: str, severidad: SeveridadFalla) -> str:
     Returns:
         str: Texto con la solución sugerida para el usuario
     """
-    soluciones: Dict[str, str] = {
-        # Fallas de motor
-        "sobrecalentamiento": "🌡️ Detener la moto inmediatamente. Revisar nivel de refrigerante y sistema de enfriamiento. NO continuar hasta resolver.",
-        "sobrecalentamiento_extremo": "🚨 PELIGRO: Apagar motor AHORA. Esperar enfriamiento completo (30 min). Llamar asistencia.",
-        "presion_aceite_baja": "⚠️ Apagar motor inmediatamente. Revisar nivel de aceite. Si está bajo, NO encender hasta llenar. Puede haber fuga o falla de bomba.",
-        
-        # Fallas eléctricas
-        "bateria_baja": "🔋 Recargar batería. Si persiste, revisar alternador y conexiones. Evitar usar accesorios eléctricos.",
-        "falla_sistema_electrico": "⚡ Revisar conexiones, fusibles y alternador. Llevar a taller especializado.",
-        
-        # Fallas de combustible
-        "nivel_combustible_critico": "⛽ Cargar combustible inmediatamente. Evitar agotar completamente el tanque.",
-        "fuga_combustible": "🚨 DETENER MOTO. No encender. Revisar tanque, mangueras y carburador. Llamar asistencia.",
-        
-        # Fallas de frenos
-        "falla_frenos": "🛑 PELIGRO: No conducir. Revisar líquido de frenos, pastillas y discos. Llevar en grúa.",
-        "desgaste_pastillas_frenos": "🔧 Programar cambio de pastillas próximamente. Evitar frenadas bruscas.",
-        
-        # Fallas de neumáticos
-        "presion_neumaticos_baja": "🏍️ Revisar y ajustar presión de neumáticos. Delantero: 2.5 bar, Trasero: 2.9 bar (KTM 390).",
-        "desgaste_neumaticos": "🛞 Programar reemplazo de neumáticos. Profundidad mínima: 1.6mm.",
-        
-        # Fallas de suspensión
-        "falla_suspension": "🔩 Revisar amortiguadores, horquilla y rodamientos. Ajustar precarga si es necesario.",
-        
-        # Fallas de transmisión
-        "falla_cadena": "⛓️ Revisar tensión, lubricación y estado de cadena. Ajustar tensión o reemplazar si está muy desgastada.",
-        "falla_embrague": "🎛️ Revisar cable de embrague y ajuste. Puede necesitar cambio de discos.",
-        
-        # Otras fallas
-        "vibracion_anormal": "📳 Revisar balanceo de neumáticos, rodamientos y motor. Verificar montajes.",
-        "ruido_anormal": "🔊 Identificar origen del ruido (motor, cadena, frenos). Revisar en taller.",
-        "caida_detectada": "💥 Revisar daños estructurales, líquidos, controles y componentes críticos. Inspección completa obligatoria.",
-        "perdida_direccion": "🚨 PELIGRO EXTREMO: No conducir. Revisar dirección, horquilla, rodamientos y cuadro."
-    }
-    
-    # Buscar solución específica por tipo
-    solucion = soluciones.get(tipo.lower())
-    
-    if solucion:
-        return solucion
-    
-    # Solución genérica según severidad
-    if severidad == SeveridadFalla.CRITICA:
-        return "🚨 CRÍTICO: Detener la moto de inmediato y solicitar asistencia técnica. No continuar hasta diagnosticar el problema."
-    elif severidad == SeveridadFalla.ALTA:
-        return "⚠️ ALTA: Programar revisión urgente en taller. Evitar uso prolongado hasta resolver."
-    elif severidad == SeveridadFalla.MEDIA:
-        return "🔧 MEDIA: Agendar revisión en taller en los próximos días. Monitorear comportamiento."
-    else:  # BAJA
-        return "ℹ️ BAJA: Revisar en próximo mantenimiento preventivo. Continuar monitoreando."
+    # Solución específica por tipo; si no hay, genérica según severidad
+    return (
+        _SOLUCIONES.get(tipo.lower())
+        or _SOLUCION_POR_SEVERIDAD.get(severidad, _SOLUCION_BAJA)
+    )
 
 
 # =============================================================================
@@ -174,37 +203,7 @@ def can_auto_resolve(
         return False
     
     # Tipos que pueden auto-resolverse
-    tipos_auto_resolubles = [
-        "vibracion_leve",
-        "temperatura_alta_temporal",
-        "bateria_baja_temporal",
-        "presion_neumaticos_baja_leve"
-    ]
-    
-    return tipo.lower() in tipos_auto_resolubles
-
-
-# =============================================================================
-# GENERAR CÓDIGO DE FALLA
-# =============================================================================
-
-def generate_falla_codigo(fecha: Optional[datetime] = None) -> str:
-    """
-    Genera un código único para una falla.
-    
-    Formato: FL-YYYYMMDD-NNN
-    Ejemplo: FL-20251110-001
-    
-    Args:
-        fecha: Fecha para el código (default: ahora)
-        
-    Returns:
-        str: Código base (sin el número secuencial final, lo agrega el repo)
-    """
-    if fecha is None:
-        fecha = datetime.now(timezone.utc)
-    
-    return f"FL-{fecha.strftime('%Y%m%d')}-"
+    return tipo.lower() in _TIPOS_AUTO_RESOLUBLES
 
 
 # =============================================================================
@@ -221,14 +220,11 @@ def determine_severidad_from_estado(estado_componente: str) -> SeveridadFalla:
     Returns:
         SeveridadFalla: Severidad correspondiente
     """
-    estado_map = {
-        "CRITICO": SeveridadFalla.CRITICA,
-        "ATENCION": SeveridadFalla.ALTA,
-        "MANTENIMIENTO": SeveridadFalla.MEDIA,
-        "BUENO": SeveridadFalla.BAJA
-    }
-    
-    return estado_map.get(estado_componente.upper(), SeveridadFalla.MEDIA)
+    # Solo se normaliza a mayúsculas si la entrada no viene ya normalizada
+    severidad = _SEVERIDAD_POR_ESTADO.get(estado_componente)
+    if severidad is not None:
+        return severidad
+    return _SEVERIDAD_POR_ESTADO.get(estado_componente.upper(), SeveridadFalla.MEDIA)
 
 
 # =============================================================================
@@ -253,23 +249,13 @@ def calculate_prioridad(
     Returns:
         int: Valor de prioridad (1-10)
     """
-    prioridad = 5  # Base
-    
-    # Ajustar por severidad
-    if severidad == SeveridadFalla.CRITICA:
-        prioridad += 4
-    elif severidad == SeveridadFalla.ALTA:
-        prioridad += 2
-    elif severidad == SeveridadFalla.BAJA:
-        prioridad -= 2
-    
-    # Ajustar por capacidad de conducir
-    if not puede_conducir:
-        prioridad += 2
-    
-    # Ajustar por atención inmediata
-    if requiere_atencion_inmediata:
-        prioridad += 1
+    # Base 5 + ajuste por severidad + 2 si no puede conducir + 1 si es urgente
+    prioridad = (
+        5
+        + _AJUSTE_PRIORIDAD_SEVERIDAD.get(severidad, 0)
+        + 2 * (not puede_conducir)
+        + requiere_atencion_inmediata
+    )
     
-    # Limitar rango
-    return max(1, min(10, prioridad))
+    # Limitar rango (inline, sin llamadas a max/min)
+    return 1 if prioridad < 1 else 10 if prioridad > 10 else prioridad
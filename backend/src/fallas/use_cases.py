@@ -2,10 +2,12 @@
 Casos de uso para gestión de fallas.
 MVP v2.3 - Actualizado para schema simplificado
 """
+import asyncio
 from datetime import datetime, timezone
-from typing import List, Tuple
+from typing import Any, Dict, List, NoReturn, Optional, Tuple
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.shared.exceptions import (
     ResourceNotFoundException,
@@ -14,7 +16,7 @@ from src.shared.exceptions import (
 from src.shared.base_models import PaginationParams
 
 from .models import Falla, EstadoFalla, SeveridadFalla, OrigenDeteccion
-from .repositories import FallaRepository
+from .repositories import FallaRepository, flags_conduccion_sql
 from .schemas import (
     FallaCreate,
     FallaUpdate,
@@ -39,6 +41,32 @@ from .events import (
 )
 
 
+_UTC = timezone.utc
+
+# Severidades que siempre requieren atención inmediata
+_SEVERIDADES_URGENTES = frozenset((SeveridadFalla.CRITICA, SeveridadFalla.ALTA))
+
+
+async def _rechazar_actualizacion(
+    repo: FallaRepository,
+    falla_id: int,
+    nuevo_estado: Optional[EstadoFalla] = None
+) -> NoReturn:
+    """
+    Explica por qué un UPDATE ... RETURNING no devolvió fila.
+    
+    Solo se ejecuta en el camino de error: distingue falla inexistente
+    (404) de transición de estado inválida (400).
+    """
+    falla = await repo.get_by_id(falla_id)
+    if not falla:
+        raise ResourceNotFoundException("Falla", str(falla_id))
+    if nuevo_estado is not None:
+        validate_transition_estado(falla.estado, nuevo_estado)
+    # El estado cambió entre el UPDATE y esta lectura (petición concurrente)
+    raise ValidationException(f"La falla {falla_id} fue modificada por otra operación")
+
+
 # =============================================================================
 # CREAR FALLA (Detección Automática o Reporte Manual)
 # =============================================================================
@@ -77,15 +105,6 @@ class CreateFallaUseCase:
         # Validar datos
         await validate_falla_data(data, self.session)
         
-        # Generar código único
-        fecha_actual = datetime.now(timezone.utc)
-        codigo_base = f"FL-{fecha_actual.strftime('%Y%m%d')}-"
-        
-        # Obtener siguiente número secuencial del día
-        count_hoy = await self.repo.count_by_date(fecha_actual.date())
-        numero_secuencial = str(count_hoy + 1).zfill(3)
-        codigo = f"{codigo_base}{numero_secuencial}"
-        
         # Determinar si puede conducir
         puede_conducir = determine_puede_conducir(data.tipo, data.severidad)
         
@@ -94,7 +113,7 @@ class CreateFallaUseCase:
         
         # Determinar si requiere atención inmediata
         requiere_atencion_inmediata = (
-            data.severidad in [SeveridadFalla.CRITICA, SeveridadFalla.ALTA] or
+            data.severidad in _SEVERIDADES_URGENTES or
             not puede_conducir
         )
         
@@ -102,7 +121,7 @@ class CreateFallaUseCase:
         falla = Falla(
             moto_id=data.moto_id,
             componente_id=data.componente_id,
-            codigo=codigo,
+            # codigo lo asigna el trigger trg_fallas_codigo en el INSERT
             tipo=data.tipo.lower(),
             descripcion=data.descripcion,
             severidad=data.severidad,
@@ -112,8 +131,7 @@ class CreateFallaUseCase:
             longitud=data.longitud,
             puede_conducir=puede_conducir,
             requiere_atencion_inmediata=requiere_atencion_inmediata,
-            solucion_sugerida=solucion_sugerida,
-            fecha_deteccion=fecha_actual
+            solucion_sugerida=solucion_sugerida
         )
         
         # Guardar
@@ -174,20 +192,17 @@ class DiagnosticarFallaUseCase:
             ResourceNotFoundException: Si la falla no existe
             ValidationException: Si la transición de estado no es válida
         """
-        # Obtener falla
-        falla = await self.repo.get_by_id(falla_id)
-        if not falla:
-            raise ResourceNotFoundException("Falla", str(falla_id))
-        
-        # Validar transición de estado (DETECTADA → EN_REPARACION)
-        validate_transition_estado(falla.estado, EstadoFalla.EN_REPARACION)
-        
-        # Actualizar
-        falla.estado = EstadoFalla.EN_REPARACION
-        falla.solucion_sugerida = solucion_sugerida
-        
-        # Guardar
-        falla = await self.repo.update(falla)
+        # Transición DETECTADA → EN_REPARACION en un solo UPDATE ... RETURNING
+        falla = await self.repo.update_returning(
+            falla_id,
+            {
+                "estado": EstadoFalla.EN_REPARACION,
+                "solucion_sugerida": solucion_sugerida,
+            },
+            estado_previo=EstadoFalla.DETECTADA
+        )
+        if falla is None:
+            await _rechazar_actualizacion(self.repo, falla_id, EstadoFalla.EN_REPARACION)
         
         # Emitir evento
         await FallaActualizadaEvent(
@@ -239,20 +254,17 @@ class ResolverFallaUseCase:
             ResourceNotFoundException: Si la falla no existe
             ValidationException: Si la transición no es válida
         """
-        # Obtener falla
-        falla = await self.repo.get_by_id(falla_id)
-        if not falla:
-            raise ResourceNotFoundException("Falla", str(falla_id))
-        
-        # Validar transición (EN_REPARACION → RESUELTA)
-        validate_transition_estado(falla.estado, EstadoFalla.RESUELTA)
-        
-        # Actualizar
-        falla.estado = EstadoFalla.RESUELTA
-        falla.fecha_resolucion = datetime.now(timezone.utc)
-        
-        # Guardar
-        falla = await self.repo.update(falla)
+        # Transición EN_REPARACION → RESUELTA en un solo UPDATE ... RETURNING
+        falla = await self.repo.update_returning(
+            falla_id,
+            {
+                "estado": EstadoFalla.RESUELTA,
+                "fecha_resolucion": datetime.now(_UTC),
+            },
+            estado_previo=EstadoFalla.EN_REPARACION
+        )
+        if falla is None:
+            await _rechazar_actualizacion(self.repo, falla_id, EstadoFalla.RESUELTA)
         
         # Calcular días de resolución
         dias_resolucion = 0
@@ -288,13 +300,13 @@ class UpdateFallaUseCase:
     - descripcion
     - severidad
     - solucion_sugerida
-    - latitud/longitud
     
     NO editables:
     - estado (usar DiagnosticarFalla o ResolverFalla)
     - tipo
     - moto_id, componente_id
     - fechas del sistema
+    - latitud/longitud (aceptadas por FallaUpdate, pero no son columnas de fallas)
     """
     
     def __init__(self, session: AsyncSession):
@@ -320,47 +332,38 @@ class UpdateFallaUseCase:
         Raises:
             ResourceNotFoundException: Si la falla no existe
         """
-        # Obtener falla
-        falla = await self.repo.get_by_id(falla_id)
-        if not falla:
-            raise ResourceNotFoundException("Falla", str(falla_id))
+        # Campos permitidos (latitud/longitud no son columnas de fallas)
+        valores: Dict[str, Any] = {}
         
-        # Guardar estado anterior para el evento
-        estado_anterior = falla.estado.value
-        
-        # Actualizar campos permitidos
         if data.descripcion is not None:
-            falla.descripcion = data.descripcion
+            valores["descripcion"] = data.descripcion
         
         if data.severidad is not None:
-            falla.severidad = data.severidad
-            # Recalcular puede_conducir
-            falla.puede_conducir = determine_puede_conducir(falla.tipo, data.severidad)
-            # Recalcular requiere_atencion_inmediata
-            falla.requiere_atencion_inmediata = (
-                data.severidad in [SeveridadFalla.CRITICA, SeveridadFalla.ALTA] or
-                not falla.puede_conducir
-            )
+            valores["severidad"] = data.severidad
+            # Recalcular puede_conducir y requiere_atencion_inmediata en el UPDATE
+            valores.update(flags_conduccion_sql(data.severidad))
         
         if data.solucion_sugerida is not None:
-            falla.solucion_sugerida = data.solucion_sugerida
-        
-        if data.latitud is not None:
-            falla.latitud = data.latitud
+            valores["solucion_sugerida"] = data.solucion_sugerida
         
-        if data.longitud is not None:
-            falla.longitud = data.longitud
-        
-        # Guardar
-        falla = await self.repo.update(falla)
+        if valores:
+            # Un solo UPDATE ... RETURNING (sin SELECT previo)
+            falla = await self.repo.update_returning(falla_id, valores)
+            if falla is None:
+                await _rechazar_actualizacion(self.repo, falla_id)
+        else:
+            falla = await self.repo.get_by_id(falla_id)
+            if not falla:
+                raise ResourceNotFoundException("Falla", str(falla_id))
         
-        # Emitir evento
+        # Emitir evento (el estado no se edita aquí: anterior == nuevo)
+        estado = falla.estado.value
         await FallaActualizadaEvent(
             falla_id=falla.id,
             moto_id=falla.moto_id,
             tipo=falla.tipo,
-            estado_anterior=estado_anterior,
-            estado_nuevo=falla.estado.value,
+            estado_anterior=estado,
+            estado_nuevo=estado,
             usuario_id=usuario_id
         ).emit()
         
@@ -441,7 +444,7 @@ class ListFallasByMotoUseCase:
         self,
         filters: FallaFilterParams,
         pagination: PaginationParams
-    ) -> Tuple[List[Falla], int]:
+    ) -> Tuple[List[RowMapping], int]:
         """
         Lista fallas de una moto con filtros y paginación.
         
@@ -450,26 +453,18 @@ class ListFallasByMotoUseCase:
             pagination: Parámetros de paginación (offset, limit)
             
         Returns:
-            Tupla con (lista de fallas, total de registros)
+            Tupla con (filas resumen de fallas, total de registros)
         """
         if not filters.moto_id:
             raise ValidationException("moto_id es requerido para listar fallas")
         
-        # Aplicar filtros del repository
-        fallas = await self.repo.get_by_moto(
+        # Página + total en una sola consulta (solo columnas del listado)
+        return await self.repo.get_page_by_moto(
             moto_id=filters.moto_id,
             solo_activas=filters.solo_activas or False,
             skip=pagination.offset,
             limit=pagination.limit
         )
-        
-        # Contar total
-        total = await self.repo.count_by_moto(
-            moto_id=filters.moto_id,
-            solo_activas=filters.solo_activas or False
-        )
-        
-        return fallas, total
 
 
 # =============================================================================
@@ -482,8 +477,19 @@ class GetFallaStatsUseCase:
     Feature Premium según FLUJOS_SISTEMA.md
     """
     
-    def __init__(self, session: AsyncSession):
-        self.repo = FallaRepository(session)
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        # Una sesión (y conexión del pool) por consulta para lanzarlas en paralelo
+        self.session_factory = session_factory
+    
+    async def _resumen(self, moto_id: int) -> RowMapping:
+        async with self.session_factory() as session:
+            return await FallaRepository(session).get_resumen_stats(moto_id)
+    
+    async def _distribuciones(
+        self, moto_id: int
+    ) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, int]]:
+        async with self.session_factory() as session:
+            return await FallaRepository(session).get_stats(moto_id)
     
     async def execute(self, moto_id: int) -> FallaStatsResponse:
         """
@@ -495,53 +501,21 @@ class GetFallaStatsUseCase:
         Returns:
             FallaStatsResponse: Estadísticas calculadas
         """
-        # Obtener todas las fallas de la moto
-        fallas = await self.repo.get_by_moto(moto_id, solo_activas=False, skip=0, limit=1000)
-        
-        # Calcular estadísticas
-        total = len(fallas)
-        activas = sum(1 for f in fallas if f.estado != EstadoFalla.RESUELTA)
-        resueltas = sum(1 for f in fallas if f.estado == EstadoFalla.RESUELTA)
-        criticas = sum(1 for f in fallas if f.severidad == SeveridadFalla.CRITICA)
-        
-        # Estadísticas por tipo
-        por_tipo: dict = {}
-        for falla in fallas:
-            por_tipo[falla.tipo] = por_tipo.get(falla.tipo, 0) + 1
-        
-        # Estadísticas por severidad
-        por_severidad: dict = {}
-        for falla in fallas:
-            key = falla.severidad.value
-            por_severidad[key] = por_severidad.get(key, 0) + 1
-        
-        # Estadísticas por estado
-        por_estado: dict = {}
-        for falla in fallas:
-            key = falla.estado.value
-            por_estado[key] = por_estado.get(key, 0) + 1
-        
-        # Calcular tiempo promedio de resolución (solo fallas resueltas)
-        fallas_resueltas = [f for f in fallas if f.estado == EstadoFalla.RESUELTA and f.fecha_deteccion and f.fecha_resolucion]
-        
-        if fallas_resueltas:
-            dias_resolucion = [
-                calculate_dias_resolucion(f.fecha_deteccion, f.fecha_resolucion)  # type: ignore
-                for f in fallas_resueltas
-            ]
-            tiempo_promedio_resolucion = sum(dias_resolucion) / len(dias_resolucion)
-        else:
-            tiempo_promedio_resolucion = 0.0
+        # Dos consultas agregadas en la DB (totales y distribuciones), concurrentes
+        resumen, (por_tipo, por_severidad, por_estado) = await asyncio.gather(
+            self._resumen(moto_id),
+            self._distribuciones(moto_id)
+        )
         
         return FallaStatsResponse(
-            total=total,
-            activas=activas,
-            resueltas=resueltas,
-            criticas=criticas,
+            total=resumen["total"],
+            activas=resumen["activas"],
+            resueltas=resumen["resueltas"],
+            criticas=resumen["criticas"],
             por_tipo=por_tipo,
             por_severidad=por_severidad,
             por_estado=por_estado,
-            tiempo_promedio_resolucion=tiempo_promedio_resolucion
+            tiempo_promedio_resolucion=float(resumen["tiempo_promedio_resolucion"])
         )
 
 
@@ -571,6 +545,8 @@ class AutoResolveFallasUseCase:
         fallas_activas = await self.repo.get_by_estado(EstadoFalla.DETECTADA)
         
         resueltas_count = 0
+        # Misma fecha de resolución para todo el lote
+        now = datetime.now(_UTC)
         
         for falla in fallas_activas:
             # Verificar si puede auto-resolverse
@@ -581,7 +557,7 @@ class AutoResolveFallasUseCase:
             ):
                 # Marcar como resuelta
                 falla.estado = EstadoFalla.RESUELTA
-                falla.fecha_resolucion = datetime.now(timezone.utc)
+                falla.fecha_resolucion = now
                 falla.solucion_sugerida += " [Auto-resuelta: condición normalizada]"
                 
                 await self.repo.update(falla)
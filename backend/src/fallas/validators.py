@@ -17,6 +17,15 @@ from .models import EstadoFalla
 from .schemas import FallaCreate
 
 
+# Transiciones permitidas (estado actual -> estados destino), en valores string
+_SIN_TRANSICIONES: frozenset = frozenset()
+_TRANSICIONES_VALIDAS = {
+	EstadoFalla.DETECTADA.value: frozenset((EstadoFalla.EN_REPARACION.value,)),
+	EstadoFalla.EN_REPARACION.value: frozenset((EstadoFalla.RESUELTA.value,)),
+	EstadoFalla.RESUELTA.value: _SIN_TRANSICIONES,
+}
+
+
 async def validate_falla_data(data: FallaCreate, session: AsyncSession) -> None:
 	"""
 	Valida datos mínimos antes de crear una falla.
@@ -62,32 +71,22 @@ def validate_transition_estado(estado_actual: Optional[EstadoFalla], nuevo_estad
 	Raises:
 		ValidationException: si la transición no es permitida
 	"""
-	# Normalizar a valores string
-	actual = None
+	# str-Enum: los miembros hashean igual que su valor, así que la misma
+	# tabla sirve para EstadoFalla o para strings
 	if estado_actual is None:
-		actual = None
-	elif isinstance(estado_actual, EstadoFalla):
-		actual = estado_actual.value
-	else:
-		actual = str(estado_actual)
-
-	nuevo = nuevo_estado.value if isinstance(nuevo_estado, EstadoFalla) else str(nuevo_estado)
-
-	transiciones_validas = {
-		EstadoFalla.DETECTADA.value: [EstadoFalla.EN_REPARACION.value],
-		EstadoFalla.EN_REPARACION.value: [EstadoFalla.RESUELTA.value],
-		EstadoFalla.RESUELTA.value: [],
-	}
-
-	# Si no hay estado actual (posible creación), solo permitir pasar a DETECTADA
-	if actual is None:
-		if nuevo != EstadoFalla.DETECTADA.value:
+		# Sin estado actual (posible creación): solo se permite DETECTADA
+		if nuevo_estado != EstadoFalla.DETECTADA:
+			nuevo = nuevo_estado.value if isinstance(nuevo_estado, EstadoFalla) else str(nuevo_estado)
 			raise ValidationException(f"Estado inicial inválido: {nuevo}. Debe ser '{EstadoFalla.DETECTADA.value}'")
 		return
 
-	permitidas = transiciones_validas.get(actual, [])
-	if nuevo not in permitidas:
-		if not permitidas:
-			raise ValidationException(f"No se permiten transiciones desde el estado '{actual}'")
-		raise ValidationException(f"Transición inválida: {actual} -> {nuevo}. Permitidas: {permitidas}")
+	permitidas = _TRANSICIONES_VALIDAS.get(estado_actual, _SIN_TRANSICIONES)
+	if nuevo_estado in permitidas:
+		return
 
+	# Camino de error: normalizar a valores string solo para el mensaje
+	actual = estado_actual.value if isinstance(estado_actual, EstadoFalla) else str(estado_actual)
+	nuevo = nuevo_estado.value if isinstance(nuevo_estado, EstadoFalla) else str(nuevo_estado)
+	if not permitidas:
+		raise ValidationException(f"No se permiten transiciones desde el estado '{actual}'")
+	raise ValidationException(f"Transición inválida: {actual} -> {nuevo}. Permitidas: {sorted(permitidas)}")
@@ -4,6 +4,7 @@ Punto de entrada principal de la aplicación.
 """
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 from datetime import datetime, timezone
@@ -11,7 +12,8 @@ from typing import Dict, Any
 
 from .config.settings import settings
 from .config.database import init_db, close_db, check_db_connection
-from .shared.event_bus import event_bus
+from .config.cache import close_redis
+from .shared.event_bus import event_bus, start_event_drain, stop_event_drain
 from .integraciones.llm_provider import get_llm_provider
 
 # Configure logging early using central config
@@ -170,8 +172,13 @@ async def lifespan(app: FastAPI):
     # Configurar event bus (suscribir handlers de eventos)
     print("📡 Configurando Event Bus...")
     await setup_event_handlers()
+    start_event_drain()
     print(f"✅ Event Bus configurado con {len(event_bus._subscribers)} tipos de eventos sincrónicos y {len(event_bus._async_subscribers)} tipos de eventos asíncronos")
     
+    # Construir el esquema OpenAPI una vez (FastAPI lo cachea en app.openapi_schema)
+    # para que el primer GET de /openapi.json no pague la generación completa
+    app.openapi()
+    
     print("✅ RIM Backend iniciado correctamente")
     
     yield
@@ -183,8 +190,10 @@ async def lifespan(app: FastAPI):
     
     # Cerrar conexiones de base de datos
     await close_db()
+    await close_redis()
     
     # Limpiar event bus
+    await stop_event_drain()
     event_bus.clear()
     
     print("✅ RIM Backend cerrado correctamente")
@@ -198,6 +207,7 @@ app = FastAPI(
     description=settings.APP_DESCRIPTION,
     version=settings.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson: datetime/UUID/Enum en C, bytes directos
     docs_url=f"{settings.API_PREFIX}/docs",
     redoc_url=f"{settings.API_PREFIX}/redoc",
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
@@ -257,6 +267,19 @@ async def handle_rim_exception(request, exc: RIMException):
     return JSONResponse(status_code=400, content=jsonable_encoder(payload))
 
 
+@app.exception_handler(Exception)
+async def handle_unexpected(request, exc: Exception):
+    # Último recurso: se registra una vez con traceback y se responde sin filtrar detalles internos
+    logger.error(f"Error no controlado en {request.url.path}", exc_info=exc)
+    payload = create_error_response(
+        error='INTERNAL_ERROR',
+        message="Error interno del servidor",
+        details=None,
+        path=str(request.url.path),
+    )
+    return JSONResponse(status_code=500, content=jsonable_encoder(payload))
+
+
 
 # ============================================
 # MIDDLEWARE
@@ -398,5 +421,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
+        # uvloop si está instalado (Linux/macOS); en Windows cae al loop estándar
+        loop="auto",
         log_level=(settings.LOG_LEVEL or "debug").lower()
     )
\ No newline at end of file
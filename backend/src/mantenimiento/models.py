@@ -3,10 +3,11 @@ Modelos de base de datos para el módulo de mantenimiento.
 """
 from datetime import datetime, date
 from typing import Optional
-from sqlalchemy import String, Integer, Float, Date, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import String, Integer, Float, Date, DateTime, ForeignKey, Text, Index, text, FetchedValue, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.shared.models import BaseModel
+from src.shared.db_codigo import registrar_codigo_trigger
 from src.shared.constants import TipoMantenimiento, EstadoMantenimiento
 
 
@@ -18,9 +19,21 @@ class Mantenimiento(BaseModel):
     puede ser preventivo (programado) o correctivo (por falla).
     """
     __tablename__ = "mantenimientos"
+    __table_args__ = (
+        # Índice parcial para la suma de costos: solo filas vivas con costo registrado
+        Index(
+            "ix_mantenimientos_costo_real",
+            "moto_id",
+            postgresql_include=["costo_real"],
+            postgresql_where=text("costo_real IS NOT NULL AND deleted_at IS NULL"),
+        ),
+    )
 
     # Identificación (id ya está en BaseModel)
-    codigo: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
+    # Asignado por el trigger trg_mantenimientos_codigo en el INSERT (MNT-YYYYMMDD-NNN)
+    codigo: Mapped[str] = mapped_column(
+        String(50), unique=True, index=True, nullable=False, server_default=FetchedValue()
+    )
     
     # Relación con moto
     moto_id: Mapped[int] = mapped_column(Integer, ForeignKey("motos.id"), nullable=False, index=True)
@@ -124,3 +137,9 @@ class Mantenimiento(BaseModel):
             f"tipo={self.tipo.value}, estado={self.estado.value}, "
             f"moto_id={self.moto_id})>"
         )
+
+
+# ============================================
+# CÓDIGO MNT-YYYYMMDD-NNN (trigger en PostgreSQL)
+# ============================================
+registrar_codigo_trigger(Mantenimiento.__table__, prefix="MNT", entidad="mantenimiento")
@@ -295,21 +295,16 @@ class MantenimientoRepository:
 
     async def get_costo_total(self, moto_id: Optional[int] = None) -> float:
         """Obtiene el costo total de mantenimientos."""
-        query = select(func.coalesce(func.sum(Mantenimiento.costo_real), 0))
+        # SUM ignora NULLs y COALESCE garantiza un escalar no nulo
+        query = select(
+            func.coalesce(func.sum(Mantenimiento.costo_real), 0.0)
+        ).where(Mantenimiento.deleted_at.is_(None))
         
         if moto_id:
-            query = query.where(
-                and_(
-                    Mantenimiento.moto_id == moto_id,
-                    Mantenimiento.deleted_at.is_(None)
-                )
-            )
-        else:
-            query = query.where(Mantenimiento.deleted_at.is_(None))
+            query = query.where(Mantenimiento.moto_id == moto_id)
         
         result = await self.db.execute(query)
-        valor = result.scalar_one()
-        return float(valor) if valor is not None else 0.0
+        return float(result.scalar_one())
 
     async def get_duracion_promedio(self) -> Optional[float]:
         """Calcula la duración promedio de mantenimientos completados."""
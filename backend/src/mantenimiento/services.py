@@ -1,7 +1,7 @@
 """
 Servicios de lógica de negocio para mantenimiento.
 """
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 from typing import Optional, List
 from collections import defaultdict
 
@@ -10,17 +10,17 @@ from src.shared.constants import TipoMantenimiento, EstadoMantenimiento
 from src.shared.utils import safe_divide, percentage
 
 
-def generate_codigo_mantenimiento() -> str:
-    """
-    Genera un código único para el mantenimiento.
-    Formato: MNT-YYYYMMDD-XXX
-    """
-    import random
-    now = datetime.now()
-    fecha_str = now.strftime("%Y%m%d")
-    # Usar número aleatorio para evitar colisiones cuando se crean múltiples registros rápidamente
-    random_num = random.randint(0, 999)
-    return f"MNT-{fecha_str}-{random_num:03d}"
+# Costo base por tipo de mantenimiento (S/.), construido una sola vez
+_COSTOS_BASE = {
+    TipoMantenimiento.CAMBIO_ACEITE: 120.0,          # S/. 80-150 (aceite + filtro + mano de obra)
+    TipoMantenimiento.CAMBIO_FILTRO_AIRE: 50.0,      # S/. 30-70 (filtro + limpieza)
+    TipoMantenimiento.CAMBIO_LLANTAS: 1000.0,        # S/. 800-1200 (par de llantas medianas)
+    TipoMantenimiento.REVISION_FRENOS: 150.0,        # S/. 100-200 (pastillas + revisión)
+    TipoMantenimiento.AJUSTE_CADENA: 40.0,           # S/. 30-50 (ajuste + lubricación)
+    TipoMantenimiento.REVISION_GENERAL: 250.0,       # S/. 200-300 (revisión completa)
+    TipoMantenimiento.CAMBIO_BATERIA: 280.0,         # S/. 250-350 (batería de calidad)
+    TipoMantenimiento.CAMBIO_BUJIAS: 80.0,           # S/. 60-100 (bujías + mano de obra)
+}
 
 
 def calculate_costo_estimado(tipo: TipoMantenimiento) -> float:
@@ -28,17 +28,7 @@ def calculate_costo_estimado(tipo: TipoMantenimiento) -> float:
     Calcula el costo estimado según el tipo de mantenimiento.
     Precios en soles peruanos (S/.) para motos medianas (250-400cc).
     """
-    costos_base = {
-        TipoMantenimiento.CAMBIO_ACEITE: 120.0,          # S/. 80-150 (aceite + filtro + mano de obra)
-        TipoMantenimiento.CAMBIO_FILTRO_AIRE: 50.0,      # S/. 30-70 (filtro + limpieza)
-        TipoMantenimiento.CAMBIO_LLANTAS: 1000.0,        # S/. 800-1200 (par de llantas medianas)
-        TipoMantenimiento.REVISION_FRENOS: 150.0,        # S/. 100-200 (pastillas + revisión)
-        TipoMantenimiento.AJUSTE_CADENA: 40.0,           # S/. 30-50 (ajuste + lubricación)
-        TipoMantenimiento.REVISION_GENERAL: 250.0,       # S/. 200-300 (revisión completa)
-        TipoMantenimiento.CAMBIO_BATERIA: 280.0,         # S/. 250-350 (batería de calidad)
-        TipoMantenimiento.CAMBIO_BUJIAS: 80.0,           # S/. 60-100 (bujías + mano de obra)
-    }
-    return costos_base.get(tipo, 150.0)  # Default: S/. 150
+    return _COSTOS_BASE.get(tipo, 150.0)  # Default: S/. 150
 
 
 def calculate_prioridad_base(tipo: TipoMantenimiento, es_preventivo: bool) -> int:
@@ -133,23 +123,33 @@ def calculate_tasa_completado(total: int, completados: int) -> float:
 
 def calculate_duracion_promedio(mantenimientos: List[Mantenimiento]) -> Optional[float]:
     """Calcula la duración promedio en horas."""
-    duraciones = []
+    # Una sola pasada acumulando suma y cantidad (sin lista intermedia)
+    total = 0.0
+    count = 0
     for m in mantenimientos:
         if m.duracion_servicio is not None:
-            duraciones.append(m.duracion_servicio)
+            total += m.duracion_servicio
+            count += 1
     
-    if not duraciones:
+    if count == 0:
         return None
     
-    return sum(duraciones) / len(duraciones)
+    return total / count
 
 
 def calculate_costo_promedio(mantenimientos: List[Mantenimiento]) -> float:
     """Calcula el costo promedio."""
-    costos = [m.costo_total for m in mantenimientos if m.costo_total is not None]
-    if not costos:
+    total = 0.0
+    count = 0
+    for m in mantenimientos:
+        if m.costo_total is not None:
+            total += m.costo_total
+            count += 1
+    
+    if count == 0:
         return 0.0
-    return sum(costos) / len(costos)
+    
+    return total / count
 
 
 def get_recomendaciones_mantenimiento(
@@ -386,7 +386,6 @@ async def crear_mantenimientos_iniciales(
         
         # Crear objeto Mantenimiento con solo los campos que existen en la tabla
         mantenimiento = Mantenimiento(
-            codigo=generate_codigo_mantenimiento(),
             moto_id=moto_id,
             tipo=tipo_valor,  # Usar el valor extraído explícitamente
             estado=EstadoMantenimiento.PENDIENTE,
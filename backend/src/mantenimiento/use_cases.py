@@ -39,9 +39,6 @@ class CreateMantenimientoUseCase:
     
     async def execute(self, data: MantenimientoCreate) -> Mantenimiento:
         """Crea un nuevo mantenimiento."""
-        # Generar código único
-        codigo = services.generate_codigo_mantenimiento()
-        
         # Calcular valores automáticos
         if data.costo_estimado is None:
             costo_estimado = services.calculate_costo_estimado(data.tipo)
@@ -91,7 +88,7 @@ class CreateMantenimientoUseCase:
         
         # Crear mantenimiento
         mantenimiento = Mantenimiento(
-            codigo=codigo,
+            # codigo lo asigna el trigger trg_mantenimientos_codigo en el INSERT
             moto_id=data.moto_id,
             tipo=data.tipo,
             estado=EstadoMantenimiento.PENDIENTE,
@@ -148,8 +145,6 @@ class CreateMantenimientoMLUseCase:
     
     async def execute(self, data: MantenimientoMLCreate) -> Mantenimiento:
         """Crea un mantenimiento recomendado por IA."""
-        codigo = services.generate_codigo_mantenimiento()
-        
         # Calcular valores
         costo_estimado = services.calculate_costo_estimado(data.tipo)
         
@@ -167,7 +162,7 @@ class CreateMantenimientoMLUseCase:
         
         # Crear mantenimiento
         mantenimiento = Mantenimiento(
-            codigo=codigo,
+            # codigo lo asigna el trigger trg_mantenimientos_codigo en el INSERT
             moto_id=data.moto_id,
             tipo=data.tipo,
             estado=EstadoMantenimiento.PENDIENTE,
@@ -28,6 +28,7 @@ Cambios v2.3:
 - Algoritmo MAX para agregación de estados (FLUJO #13)
 """
 import logging
+from collections import Counter
 from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
@@ -173,17 +174,12 @@ class SensorService:
             
             # Calcular scores por sensor
             sensor_scores: List[int] = []
-            state_counts: Dict[str, int] = {}
             sensor_contributions: Dict[str, Dict[str, Any]] = {}
             
             for sensor in sensores:
                 score: int = state_scores.get(sensor.sensor_state, 2)
                 sensor_scores.append(score)
                 
-                # Contar estados
-                state_key: str = sensor.sensor_state.value
-                state_counts[state_key] = state_counts.get(state_key, 0) + 1
-                
                 # Guardar contribución de cada sensor
                 sensor_contributions[str(sensor.id)] = {
                     "tipo": sensor.tipo,
@@ -191,6 +187,11 @@ class SensorService:
                     "score": score
                 }
             
+            # Contar estados (Counter cuenta en C, una sola pasada)
+            state_counts: Dict[str, int] = dict(
+                Counter(sensor.sensor_state.value for sensor in sensores)
+            )
+            
             # Agregar con MAX
             max_score: int = max(sensor_scores)
             
@@ -0,0 +1,117 @@
+"""
+Códigos PREFIJO-YYYYMMDD-NNN generados en PostgreSQL.
+
+Un contador atómico por día y un trigger BEFORE INSERT asignan el código
+cuando la fila llega sin él. El DDL es idempotente: se ejecuta al crear la
+tabla (create_all) y en cada init_db, para instalar o actualizar el trigger
+en bases ya existentes (mismo DDL que docs/UPDATE_CODIGO_TRIGGERS.sql).
+"""
+from typing import List, Tuple
+
+from sqlalchemy import DDL, Table, event
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+# DDL de cada tabla con código registrada (lo ejecuta init_db)
+_TRIGGERS_CODIGO: List[Tuple[DDL, ...]] = []
+
+
+def codigo_trigger_ddl(
+    table: str,
+    prefix: str,
+    entidad: str,
+    dia_sql: str = "CURRENT_DATE",
+) -> Tuple[DDL, ...]:
+    """
+    Construye el DDL idempotente del código de una tabla.
+
+    Args:
+        table: Tabla destino (ej: "fallas")
+        prefix: Prefijo del código (ej: "FL")
+        entidad: Nombre de la función y del CHECK (asignar_codigo_<entidad>,
+            chk_codigo_<entidad>_format)
+        dia_sql: Expresión SQL con la fecha del código (puede usar NEW)
+
+    Returns:
+        Sentencias DDL en orden de ejecución
+    """
+    contador = f"{table}_codigo_contador"
+    funcion = f"asignar_codigo_{entidad}"
+    check = f"chk_codigo_{entidad}_format"
+    trigger = f"trg_{table}_codigo"
+    return (
+        DDL(f"""
+            CREATE TABLE IF NOT EXISTS {contador} (
+                fecha DATE PRIMARY KEY,
+                ultimo INTEGER NOT NULL
+            )
+        """),
+        # lpad trunca en PostgreSQL: desde el número 1000 del día se usan más dígitos
+        DDL(f"""
+            CREATE OR REPLACE FUNCTION {funcion}() RETURNS TRIGGER AS $$
+            DECLARE
+                dia DATE := {dia_sql};
+                numero INTEGER;
+            BEGIN
+                INSERT INTO {contador} AS c (fecha, ultimo)
+                VALUES (dia, 1)
+                ON CONFLICT (fecha) DO UPDATE SET ultimo = c.ultimo + 1
+                RETURNING ultimo INTO numero;
+                NEW.codigo := '{prefix}-' || to_char(dia, 'YYYYMMDD') || '-' ||
+                    CASE WHEN numero < 1000 THEN lpad(numero::text, 3, '0') ELSE numero::text END;
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+        """),
+        # Bases creadas con el CHECK antiguo de exactamente 3 dígitos
+        DDL(rf"""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM pg_constraint
+                    WHERE conname = '{check}'
+                      AND position('{{3,}}' IN pg_get_constraintdef(oid)) = 0
+                ) THEN
+                    ALTER TABLE {table} DROP CONSTRAINT {check};
+                    ALTER TABLE {table} ADD CONSTRAINT {check}
+                        CHECK (codigo ~ '^{prefix}-\d{{8}}-\d{{3,}}$');
+                END IF;
+            END;
+            $$
+        """),
+        DDL(f"DROP TRIGGER IF EXISTS {trigger} ON {table}"),
+        DDL(f"""
+            CREATE TRIGGER {trigger}
+                BEFORE INSERT ON {table}
+                FOR EACH ROW WHEN (NEW.codigo IS NULL)
+                EXECUTE FUNCTION {funcion}()
+        """),
+    )
+
+
+def registrar_codigo_trigger(
+    table: Table,
+    prefix: str,
+    entidad: str,
+    dia_sql: str = "CURRENT_DATE",
+) -> None:
+    """
+    Instala el trigger de código al crear la tabla y lo registra para init_db.
+
+    Args:
+        table: Tabla del modelo (Modelo.__table__)
+        prefix: Prefijo del código
+        entidad: Nombre de la función y del CHECK
+        dia_sql: Expresión SQL con la fecha del código
+    """
+    ddls = codigo_trigger_ddl(table.name, prefix, entidad, dia_sql)
+    for ddl in ddls:
+        event.listen(table, "after_create", ddl.execute_if(dialect="postgresql"))
+    _TRIGGERS_CODIGO.append(ddls)
+
+
+async def instalar_triggers_codigo(conn: AsyncConnection) -> None:
+    """Ejecuta el DDL de todas las tablas con código registradas."""
+    for ddls in _TRIGGERS_CODIGO:
+        for ddl in ddls:
+            await conn.execute(ddl)
@@ -2,7 +2,7 @@
 Event Bus para comunicación desacoplada entre módulos.
 Implementa patrón Observer/Publisher-Subscriber.
 """
-from typing import Callable, Dict, List, Type, Awaitable, Any
+from typing import Callable, Dict, List, Optional, Type, Awaitable, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 import asyncio
@@ -151,6 +151,78 @@ class EventBus:
 event_bus = EventBus()
 
 
+# ============================================
+# COLA DE EVENTOS DE LOG (emit no bloqueante)
+# ============================================
+EVENT_QUEUE_MAXSIZE = 10000
+EVENT_DRAIN_BATCH_SIZE = 128
+
+_event_queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
+_drain_task: Optional["asyncio.Task[None]"] = None
+
+
+def _log_event(event: Any) -> None:
+    """Registra un evento (lo que hace el consumidor con cada elemento de la cola)."""
+    logger.debug("Evento: %r", event)
+
+
+def enqueue_event(event: Any) -> None:
+    """
+    Encola un evento para que el consumidor en background lo registre.
+    
+    Nunca bloquea al productor. Si el consumidor no está corriendo (p. ej.
+    en scripts o tests sin lifespan), el evento se registra inline. Si la
+    cola está llena, el evento se descarta con un warning.
+    """
+    if _drain_task is None or _drain_task.done():
+        _log_event(event)
+        return
+    try:
+        _event_queue.put_nowait(event)
+    except asyncio.QueueFull:
+        logger.warning(
+            "Cola de eventos llena (%d), evento descartado: %s",
+            EVENT_QUEUE_MAXSIZE, type(event).__name__,
+        )
+
+
+async def _drain_events() -> None:
+    """Consume la cola de eventos y los registra en lotes."""
+    while True:
+        batch = [await _event_queue.get()]
+        while not _event_queue.empty() and len(batch) < EVENT_DRAIN_BATCH_SIZE:
+            batch.append(_event_queue.get_nowait())
+        if logger.isEnabledFor(logging.DEBUG):
+            for event in batch:
+                _log_event(event)
+        for _ in batch:
+            _event_queue.task_done()
+
+
+def start_event_drain() -> None:
+    """Inicia el consumidor de la cola de eventos (llamar en el startup de la app)."""
+    global _drain_task
+    if _drain_task is None or _drain_task.done():
+        _drain_task = asyncio.create_task(_drain_events())
+
+
+async def stop_event_drain() -> None:
+    """Detiene el consumidor de la cola de eventos (llamar en el shutdown)."""
+    global _drain_task
+    if _drain_task is None:
+        return
+    _drain_task.cancel()
+    try:
+        await _drain_task
+    except asyncio.CancelledError:
+        pass
+    _drain_task = None
+    # Registrar lo que quedó pendiente en la cola
+    while not _event_queue.empty():
+        _log_event(_event_queue.get_nowait())
+        _event_queue.task_done()
+
+
 # ============================================
 # DEPENDENCY PARA FASTAPI
 # ============================================
@@ -7,9 +7,14 @@ from typing import Callable, TYPE_CHECKING
 from fastapi import Request, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from redis.exceptions import RedisError
+import logging
+
 from .constants import Feature, PlanType, FREEMIUM_FEATURES, PREMIUM_FEATURES
 from .exceptions import PremiumRequiredException, UnauthorizedException
 
+logger = logging.getLogger(__name__)
+
 # Importación condicional para evitar circular imports
 if TYPE_CHECKING:
     from ..config.database import get_db
@@ -18,6 +23,35 @@ if TYPE_CHECKING:
 # ============================================
 # VERIFICACIÓN DE PERMISOS
 # ============================================
+# Nivel de acceso cacheado por usuario: evita consultar la suscripción en cada request
+FEATURE_ACCESS_CACHE_TTL = 60
+_NIVEL_ACCESO_KEY = "suscripciones:nivel:{user_id}"
+_FEATURES_POR_NIVEL = {
+    PlanType.PREMIUM.value: frozenset(PREMIUM_FEATURES),
+    PlanType.FREEMIUM.value: frozenset(FREEMIUM_FEATURES),
+    "ninguno": frozenset(),
+}
+
+
+async def _resolver_nivel_acceso(user_id: int | str, db: AsyncSession) -> str:
+    """Determina el nivel de acceso (premium/freemium) desde la suscripción."""
+    # Importación tardía para evitar dependencias circulares
+    from ..suscripciones.models import EstadoSuscripcion, Plan
+    from ..suscripciones.services import SuscripcionService
+    
+    suscripcion = await SuscripcionService(db).get_suscripcion_usuario(int(user_id))
+    
+    # Sin suscripción o cancelada: solo acceso freemium
+    if suscripcion is None or suscripcion.estado_suscripcion != EstadoSuscripcion.ACTIVA:
+        return PlanType.FREEMIUM.value
+    
+    # Plan cargado explícitamente: un acceso lazy a suscripcion.plan no es posible en async
+    plan = await db.get(Plan, suscripcion.plan_id)
+    if plan is None or plan.nombre_plan.lower() == "free":
+        return PlanType.FREEMIUM.value
+    return PlanType.PREMIUM.value
+
+
 async def check_feature_access(
     user_id: str,
     feature: Feature,
@@ -26,6 +60,9 @@ async def check_feature_access(
     """
     Verifica si un usuario tiene acceso a una feature específica.
     
+    El nivel de acceso del usuario se cachea en Redis durante
+    FEATURE_ACCESS_CACHE_TTL segundos; los cambios de plan lo invalidan.
+    
     Args:
         user_id: ID del usuario
         feature: Feature a verificar
@@ -34,25 +71,30 @@ async def check_feature_access(
     Returns:
         True si tiene acceso, False si no
     """
-    # Importación tardía para evitar dependencias circulares
-    from ..suscripciones.services import SubscriptionService
-    
-    service = SubscriptionService(db)
+    from ..config.cache import get_redis
     
+    key = _NIVEL_ACCESO_KEY.format(user_id=user_id)
+    nivel = None
     try:
-        subscription = await service.get_active_subscription(user_id)
-        
-        # Verificar según el plan
-        if subscription.plan.nombre == PlanType.PREMIUM or subscription.estado == "trial":
-            return feature in PREMIUM_FEATURES
-        elif subscription.plan.nombre == PlanType.FREEMIUM:
-            return feature in FREEMIUM_FEATURES
-        else:
-            return False
-            
-    except Exception:
-        # Si no hay suscripción, solo acceso freemium
-        return feature in FREEMIUM_FEATURES
+        nivel = await get_redis().get(key)
+    except RedisError as e:
+        logger.warning(f"Redis no disponible, verificando acceso sin cache: {e}")
+    
+    if nivel is None:
+        nivel = await _resolver_nivel_acceso(user_id, db)
+        try:
+            await get_redis().set(key, nivel, ex=FEATURE_ACCESS_CACHE_TTL)
+        except RedisError as e:
+            logger.warning(f"No se pudo cachear {key}: {e}")
+    
+    return feature in _FEATURES_POR_NIVEL.get(nivel, _FEATURES_POR_NIVEL["ninguno"])
+
+
+async def invalidate_feature_access(user_id: int | str) -> None:
+    """Invalida el nivel de acceso cacheado de un usuario (tras cambios de plan)."""
+    from ..config.cache import invalidate
+    
+    await invalidate(_NIVEL_ACCESO_KEY.format(user_id=user_id))
 
 
 def require_premium(feature: Feature):
@@ -87,7 +87,8 @@ def clamp(value: float, min_value: float, max_value: float) -> float:
 
 def percentage(part: float, total: float) -> float:
     """Calcula porcentaje con manejo de división por 0."""
-    return safe_divide(part * 100, total, 0.0)
+    # Inline de safe_divide: evita una llamada extra por porcentaje
+    return part * 100 / total if total != 0 else 0.0
 
 
 def round_to_decimals(value: float, decimals: int = 2) -> float:
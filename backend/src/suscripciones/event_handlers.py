@@ -6,8 +6,9 @@ import logging
 from src.auth.events import UserRegisteredEvent
 from src.config.database import AsyncSessionLocal
 from src.shared.event_bus import event_bus
+from src.shared.middleware import invalidate_feature_access
 
-from .events import emit_suscripcion_created
+from .events import PlanChangedEvent, SuscripcionCancelledEvent, emit_suscripcion_created
 from .repositories import PlanesRepository, SuscripcionRepository
 from .services import SuscripcionService
 
@@ -81,9 +82,21 @@ async def handle_user_registered(event: UserRegisteredEvent) -> None:
             raise
 
 
+async def handle_plan_changed(event: PlanChangedEvent | SuscripcionCancelledEvent) -> None:
+    """
+    Invalida el nivel de acceso cacheado del usuario cuando cambia su plan.
+    
+    Args:
+        event: Evento de cambio de plan o de cancelación
+    """
+    await invalidate_feature_access(event.usuario_id)
+
+
 def register_event_handlers() -> None:
     """
     Registra los manejadores de eventos del módulo de suscripciones.
     """
     event_bus.subscribe_async(UserRegisteredEvent, handle_user_registered)
+    event_bus.subscribe_async(PlanChangedEvent, handle_plan_changed)
+    event_bus.subscribe_async(SuscripcionCancelledEvent, handle_plan_changed)
     logger.info("[register_event_handlers] Suscripciones: Manejadores de eventos registrados.")
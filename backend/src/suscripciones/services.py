@@ -444,6 +444,10 @@ class SuscripcionService:
 
         await self.session.commit()
         await self.session.refresh(suscripcion)
+        
+        # Suscripción nueva: no hay PlanChangedEvent, se invalida aquí el nivel cacheado
+        from src.shared.middleware import invalidate_feature_access
+        await invalidate_feature_access(usuario_id)
         return suscripcion
 
 
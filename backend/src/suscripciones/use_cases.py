@@ -411,6 +411,8 @@ class CancelSuscripcionUseCase:
         if not plan_free:
             raise ValueError("Plan Free no encontrado")
         
+        plan_cancelado = suscripcion.plan.nombre_plan if suscripcion.plan else "Unknown"
+        
         # Actualizar a Free y marcar como cancelada
         suscripcion.plan_id = plan_free.id
         suscripcion.estado_suscripcion = EstadoSuscripcion.CANCELADA
@@ -421,6 +423,19 @@ class CancelSuscripcionUseCase:
         
         logger.info("CancelSuscripcionUseCase: Suscripción cancelada usuario_id=%s", usuario_id)
         
+        # Emitir evento de cancelación (invalida el nivel de acceso cacheado)
+        try:
+            from .events import emit_suscripcion_cancelled
+            
+            await emit_suscripcion_cancelled(
+                suscripcion_id=suscripcion.id,
+                usuario_id=usuario_id,
+                plan_nombre=plan_cancelado,
+                cancelled_by=usuario_id,
+            )
+        except Exception as e:
+            logger.warning(f"Error al emitir evento de cancelación: {e}")
+        
         # Cargar plan con eager loading
         plan = await planes_repo.get_plan_by_id(suscripcion.plan_id)
         
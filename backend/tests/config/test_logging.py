@@ -0,0 +1,102 @@
+"""
+Handler de logging con hilo de escritura (_FastHandler).
+"""
+import io
+import logging
+import threading
+
+import pytest
+
+from src.config.logging import _FastHandler
+
+
+def _record(msg: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, None, None)
+
+
+class _FlakyStream(io.StringIO):
+    """Stream cuyo primer flush falla (como un stdout cerrado)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.fallos = 1
+
+    def flush(self) -> None:
+        if self.fallos:
+            self.fallos -= 1
+            raise ValueError("I/O operation on closed file.")
+        super().flush()
+
+
+class _BlockingStream(io.StringIO):
+    """Stream que bloquea el primer write hasta que se libera."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.bloqueado = threading.Event()
+        self.liberar = threading.Event()
+
+    def write(self, s: str) -> int:
+        if not self.liberar.is_set():
+            self.bloqueado.set()
+            self.liberar.wait(5)
+        return super().write(s)
+
+
+@pytest.fixture(autouse=True)
+def sin_trazas_de_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(logging, "raiseExceptions", False)
+
+
+def test_un_flush_fallido_no_detiene_el_hilo():
+    stream = _FlakyStream()
+    handler = _FastHandler(stream)
+    try:
+        handler.emit(_record("primero"))
+        handler.flush()
+        handler.emit(_record("segundo"))
+        handler.flush()
+
+        assert handler._thread.is_alive()
+        assert stream.getvalue() == "primero\nsegundo\n"
+    finally:
+        handler.close()
+
+
+def test_el_hilo_se_relanza_si_murio():
+    stream = io.StringIO()
+    handler = _FastHandler(stream)
+    try:
+        handler.emit(_record("antes"))
+        handler.flush()
+        muerto = handler._thread
+        handler._queue.put(handler._STOP)
+        muerto.join(1)
+
+        handler.emit(_record("después"))
+        handler.flush()
+
+        assert handler._thread is not muerto
+        assert stream.getvalue() == "antes\ndespués\n"
+    finally:
+        handler.close()
+
+
+def test_cola_llena_descarta_y_cuenta():
+    stream = _BlockingStream()
+    handler = _FastHandler(stream, max_queue=1)
+    try:
+        handler.emit(_record("escribiendo"))
+        assert stream.bloqueado.wait(1)
+        handler.emit(_record("en cola"))
+        handler.emit(_record("descartado"))
+        stream.liberar.set()
+        handler.flush()
+
+        assert handler.dropped == 1
+        salida = stream.getvalue()
+        assert "descartado\n" not in salida
+        assert salida.startswith("escribiendo\nen cola\n")
+        assert "1 registros descartados" in salida
+    finally:
+        handler.close()
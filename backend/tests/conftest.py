@@ -0,0 +1,106 @@
+"""
+Fixtures compartidas para los tests del backend.
+
+Los tests de repositorios corren contra PostgreSQL real (ENUMs nativos,
+índices parciales y triggers del esquema): usan TEST_DATABASE_URL o, si no
+está definida, DATABASE_URL. Cada test trabaja dentro de una transacción
+que se revierte al terminar.
+"""
+import os
+from contextlib import contextmanager
+from typing import AsyncIterator, Callable, ContextManager, Iterator, List
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import src.main  # noqa: F401  (registra todos los modelos para configurar los mappers)
+from src.config.settings import settings
+from src.shared.db_codigo import instalar_triggers_codigo
+from src.shared.models import Base
+
+
+# ============================================
+# CONTRATO DE CARGA
+# ============================================
+
+@pytest.fixture(autouse=True)
+def strict_loading(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Activa raiseload("*") en los repositorios: un lazy load lanza error en vez de hacer N+1.
+
+    Settings es inmutable, así que se reemplaza la referencia que lee el
+    repositorio por una copia con el flag activo.
+    """
+    monkeypatch.setattr(
+        "src.fallas.repositories.settings",
+        settings.model_copy(update={"STRICT_LOADING": True}),
+    )
+
+
+# ============================================
+# BASE DE DATOS
+# ============================================
+
+@pytest_asyncio.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    """Engine sin pool contra la DB de tests (crea el esquema si falta, como init_db)."""
+    url = os.getenv("TEST_DATABASE_URL", settings.DATABASE_URL)
+    engine = create_async_engine(url, poolclass=NullPool)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        # Igual que init_db: instala/actualiza los triggers de código
+        async with engine.begin() as conn:
+            await instalar_triggers_codigo(conn)
+    except OSError as e:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL no disponible para tests: {e}")
+
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
+    """Sesión ligada a una transacción externa que se revierte al final del test."""
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await trans.rollback()
+
+
+@pytest.fixture
+def count_queries(engine: AsyncEngine) -> Callable[[], ContextManager[List[str]]]:
+    """
+    Cuenta las sentencias SQL enviadas a la DB dentro de un bloque.
+
+    Uso:
+        with count_queries() as queries:
+            await repo.get_page_by_moto(moto_id)
+        assert len(queries) == 1
+    """
+    @contextmanager
+    def _count() -> Iterator[List[str]]:
+        queries: List[str] = []
+
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            queries.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        try:
+            yield queries
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+    return _count
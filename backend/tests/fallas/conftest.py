@@ -0,0 +1,29 @@
+"""
+Fixtures del módulo de fallas: datos mínimos para insertar fallas.
+"""
+from typing import Tuple
+
+import pytest_asyncio
+
+from src.auth.models import Usuario
+from src.motos.models import ModeloMoto, Moto, Componente
+
+
+@pytest_asyncio.fixture
+async def moto_componente(db) -> Tuple[int, int]:
+    """Crea usuario, modelo, moto y componente; devuelve (moto_id, componente_id)."""
+    usuario = Usuario(email="fallas@test.rim", password_hash="x", nombre="Test")
+    modelo = ModeloMoto(nombre="KTM 390 Duke (test)", marca="KTM", año=2024)
+    db.add_all([usuario, modelo])
+    await db.flush()
+
+    moto = Moto(
+        usuario_id=usuario.id,
+        modelo_moto_id=modelo.id,
+        vin="TESTVIN0000000001",
+        placa="TEST-001",
+    )
+    componente = Componente(modelo_moto_id=modelo.id, nombre="Motor (test)")
+    db.add_all([moto, componente])
+    await db.flush()
+    return moto.id, componente.id
@@ -0,0 +1,52 @@
+"""
+Generación del código FL-YYYYMMDD-NNN por el trigger de PostgreSQL.
+"""
+from datetime import datetime
+
+from sqlalchemy import text
+
+from src.fallas.models import Falla, SeveridadFalla, OrigenDeteccion
+from src.shared.db_codigo import instalar_triggers_codigo
+
+
+def _nueva_falla(moto_id: int, componente_id: int, fecha: datetime) -> Falla:
+    return Falla(
+        moto_id=moto_id,
+        componente_id=componente_id,
+        tipo="sobrecalentamiento",
+        titulo="Falla de prueba",
+        severidad=SeveridadFalla.MEDIA,
+        origen_deteccion=OrigenDeteccion.SENSOR,
+        fecha_deteccion=fecha,
+    )
+
+
+async def test_codigo_desde_la_falla_1000_no_se_trunca(db, moto_componente):
+    moto_id, componente_id = moto_componente
+    fecha = datetime(2031, 1, 10, 12, 0)
+    await db.execute(text(
+        "INSERT INTO fallas_codigo_contador (fecha, ultimo) VALUES (:fecha, 998)"
+    ), {"fecha": fecha.date()})
+
+    fallas = [_nueva_falla(moto_id, componente_id, fecha) for _ in range(2)]
+    db.add_all(fallas)
+    await db.flush()
+
+    assert [f.codigo for f in fallas] == ["FL-20310110-999", "FL-20310110-1000"]
+
+
+async def test_ddl_instala_el_trigger_en_una_bd_existente(db, moto_componente):
+    moto_id, componente_id = moto_componente
+    conn = await db.connection()
+    # Base creada antes del trigger
+    await conn.execute(text("DROP TRIGGER trg_fallas_codigo ON fallas"))
+
+    await instalar_triggers_codigo(conn)
+    # Idempotente: una segunda ejecución (siguiente arranque) no falla
+    await instalar_triggers_codigo(conn)
+
+    falla = _nueva_falla(moto_id, componente_id, datetime(2031, 1, 11, 8, 0))
+    db.add(falla)
+    await db.flush()
+
+    assert falla.codigo == "FL-20310111-001"
@@ -0,0 +1,32 @@
+"""
+El listado y el export serializan filas crudas con orjson: el JSON debe ser
+idéntico al que produce FallaListResponse en el resto de endpoints.
+"""
+from src.fallas.models import Falla, SeveridadFalla, OrigenDeteccion
+from src.fallas.routes import _CAMPOS_LISTADO, _dumps
+from src.fallas.schemas import FallaFilterParams, FallaListResponse
+from src.fallas.use_cases import ListFallasByMotoUseCase
+from src.shared.base_models import PaginationParams
+
+
+async def test_filas_crudas_igual_que_pydantic(db, moto_componente):
+    moto_id, componente_id = moto_componente
+    db.add(Falla(
+        moto_id=moto_id,
+        componente_id=componente_id,
+        tipo="sobrecalentamiento",
+        titulo="Falla de prueba",
+        severidad=SeveridadFalla.ALTA,
+        origen_deteccion=OrigenDeteccion.SENSOR,
+    ))
+    await db.flush()
+
+    fallas, _ = await ListFallasByMotoUseCase(db).execute(
+        FallaFilterParams(moto_id=moto_id),
+        PaginationParams(page=1, per_page=50),
+    )
+    fila = {campo: fallas[0][campo] for campo in _CAMPOS_LISTADO}
+
+    esperado = FallaListResponse.model_validate(fila).model_dump_json().encode()
+    assert _dumps(fila) == esperado
+    assert b'Z"' in esperado  # fechas UTC como "Z", no "+00:00"
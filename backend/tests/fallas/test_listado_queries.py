@@ -0,0 +1,68 @@
+"""
+Contrato de carga de las lecturas de fallas.
+
+El listado debe resolverse con un número fijo de consultas sin importar
+cuántas fallas tenga la página (sin N+1 por relaciones), y las lecturas de
+entidades no deben disparar lazy loads.
+"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from src.fallas.models import Falla, SeveridadFalla, OrigenDeteccion
+from src.fallas.schemas import FallaFilterParams, FallaListResponse
+from src.fallas.repositories import FallaRepository
+from src.fallas.use_cases import ListFallasByMotoUseCase
+from src.shared.base_models import PaginationParams
+
+
+async def _crear_fallas(db, moto_id: int, componente_id: int, n_fallas: int) -> None:
+    """Crea `n_fallas` fallas en la moto."""
+    db.add_all([
+        Falla(
+            moto_id=moto_id,
+            componente_id=componente_id,
+            tipo="sobrecalentamiento",
+            titulo=f"Falla de prueba {i}",
+            severidad=SeveridadFalla.MEDIA,
+            origen_deteccion=OrigenDeteccion.SENSOR,
+        )
+        for i in range(n_fallas)
+    ])
+    await db.flush()
+
+
+@pytest.mark.parametrize("n_fallas", [1, 30])
+async def test_listado_por_moto_usa_una_sola_consulta(db, count_queries, moto_componente, n_fallas):
+    moto_id, componente_id = moto_componente
+    await _crear_fallas(db, moto_id, componente_id, n_fallas)
+
+    with count_queries() as queries:
+        fallas, total = await ListFallasByMotoUseCase(db).execute(
+            FallaFilterParams(moto_id=moto_id),
+            PaginationParams(page=1, per_page=50),
+        )
+        # Misma proyección que serializa la ruta
+        items = [{campo: f[campo] for campo in FallaListResponse.model_fields} for f in fallas]
+
+    assert total == n_fallas
+    assert len(items) == n_fallas
+    # Página + total (COUNT(*) OVER ()) en una única consulta
+    assert len(queries) == 1, queries
+
+
+async def test_get_by_id_no_carga_relaciones_lazy(db, count_queries, moto_componente):
+    moto_id, componente_id = moto_componente
+    await _crear_fallas(db, moto_id, componente_id, 1)
+    falla_id = await db.scalar(select(Falla.id).where(Falla.moto_id == moto_id))
+    # Sin el identity map, la lectura construye la entidad con sus opciones de carga
+    db.expunge_all()
+
+    with count_queries() as queries:
+        falla = await FallaRepository(db).get_by_id(falla_id)
+    assert falla is not None
+    assert len(queries) == 1, queries
+
+    # Con STRICT_LOADING un acceso a una relación no precargada falla en vez de hacer SELECT
+    with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+        falla.moto
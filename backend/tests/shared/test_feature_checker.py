@@ -0,0 +1,109 @@
+"""
+Control de acceso por plan a través de FeatureChecker (dependencia de rutas).
+"""
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.auth.models import Usuario
+from src.shared.constants import Feature, PlanType
+from src.shared.exceptions import PremiumRequiredException
+from src.shared.event_bus import event_bus
+from src.shared.middleware import FeatureChecker
+from src.suscripciones.event_handlers import handle_plan_changed
+from src.suscripciones.events import SuscripcionCancelledEvent
+from src.suscripciones.models import EstadoSuscripcion, Plan, Suscripcion
+from src.suscripciones.use_cases import CancelSuscripcionUseCase
+
+
+class _RedisEnMemoria:
+    """Sustituto mínimo del cliente Redis (get/set/delete)."""
+
+    def __init__(self) -> None:
+        self.datos: Dict[str, str] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        return self.datos.get(key)
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> None:
+        self.datos[key] = value
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.datos.pop(key, None)
+
+
+@pytest.fixture
+async def redis(monkeypatch: pytest.MonkeyPatch) -> _RedisEnMemoria:
+    cliente = _RedisEnMemoria()
+    monkeypatch.setattr("src.config.cache.get_redis", lambda: cliente)
+    return cliente
+
+
+@pytest.fixture
+async def sesiones_de_test(db, monkeypatch: pytest.MonkeyPatch) -> None:
+    """FeatureChecker abre su propia sesión: se liga a la conexión del test."""
+    conn = await db.connection()
+    monkeypatch.setattr(
+        "src.config.database.AsyncSessionLocal",
+        async_sessionmaker(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint"),
+    )
+
+
+async def _crear_usuario(db, plan_nombre: Optional[str], estado=EstadoSuscripcion.ACTIVA) -> int:
+    usuario = Usuario(email=f"{plan_nombre or 'sin'}@test.rim", password_hash="x", nombre="Test")
+    db.add(usuario)
+    await db.flush()
+    if plan_nombre is not None:
+        plan = Plan(nombre_plan=f"{plan_nombre}-test" if plan_nombre != "free" else "free")
+        db.add(plan)
+        await db.flush()
+        db.add(Suscripcion(usuario_id=usuario.id, plan_id=plan.id, estado_suscripcion=estado))
+        await db.flush()
+    return usuario.id
+
+
+def _request(user_id: int) -> SimpleNamespace:
+    return SimpleNamespace(state=SimpleNamespace(user_id=user_id))
+
+
+async def test_plan_pro_accede_y_cachea_el_nivel(db, redis, sesiones_de_test):
+    user_id = await _crear_usuario(db, "pro")
+    checker = FeatureChecker(Feature.REPORTES_AVANZADOS)
+
+    assert await checker(_request(user_id)) is True
+    assert redis.datos == {f"suscripciones:nivel:{user_id}": PlanType.PREMIUM.value}
+    # Segunda llamada: resuelta desde la cache
+    assert await checker(_request(user_id)) is True
+
+
+@pytest.mark.parametrize("plan_nombre, estado", [
+    ("free", EstadoSuscripcion.ACTIVA),
+    ("pro", EstadoSuscripcion.CANCELADA),
+    (None, None),
+])
+async def test_sin_plan_pro_activo_requiere_premium(db, redis, sesiones_de_test, plan_nombre, estado):
+    user_id = await _crear_usuario(db, plan_nombre, estado)
+
+    with pytest.raises(PremiumRequiredException):
+        await FeatureChecker(Feature.REPORTES_AVANZADOS)(_request(user_id))
+    assert redis.datos[f"suscripciones:nivel:{user_id}"] == PlanType.FREEMIUM.value
+    # Las features freemium siguen disponibles
+    assert await FeatureChecker(Feature.ALERTAS_BASICAS)(_request(user_id)) is True
+
+
+async def test_cancelar_invalida_el_nivel_cacheado(db, redis, sesiones_de_test, monkeypatch):
+    user_id = await _crear_usuario(db, "pro")
+    db.add(Plan(nombre_plan="free"))
+    await db.flush()
+    checker = FeatureChecker(Feature.REPORTES_AVANZADOS)
+    assert await checker(_request(user_id)) is True
+
+    monkeypatch.setattr(event_bus, "_async_subscribers", {SuscripcionCancelledEvent: [handle_plan_changed]})
+    await CancelSuscripcionUseCase(db).execute(user_id)
+
+    assert f"suscripciones:nivel:{user_id}" not in redis.datos
+    with pytest.raises(PremiumRequiredException):
+        await checker(_request(user_id))